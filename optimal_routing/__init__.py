@@ -0,0 +1,37 @@
+"""Metaheuristic route optimization: ACO, GA and DE solvers for the TSP.
+
+Importing the package is cheap. The solver modules load on first use of the names below,
+and matplotlib only when a plot is actually drawn.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    'AdaptiveACO': '.aco.aco_gpt',
+    'MultiColonyACO': '.aco.multi_colony',
+    'DistanceMatrix': '.ga.distance_matrix',
+    'TwoOpt': '.local_search',
+    'OrOpt': '.local_search',
+    'Or2Opt': '.local_search',
+    'run_islands': '.ga.island',
+    'differential_evolution': '.de.de_gpt',
+    'Instance': '.instances',
+    'load_instance': '.instances',
+    'Budget': '.budget',
+    'Progress': '.budget',
+    'Instruments': '.instrumentation',
+    'load_checkpoint': '.checkpoint',
+    'InstanceCache': '.instance_cache',
+    'decompose': '.decomposition',
+    'solve_batch': '.batch',
+    'held_karp': '.exact',
+    'RouteService': '.service',
+    'Client': '.service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
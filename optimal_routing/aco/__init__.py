@@ -0,0 +1 @@
+"""Ant colony optimization: AdaptiveACO, MultiColonyACO and the exp_aco animation."""
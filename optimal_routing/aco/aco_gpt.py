@@ -0,0 +1,601 @@
+import numpy as np
+
+from ..budget import Budget, print_progress
+from ..checkpoint import Checkpointer, is_checkpoint, load_checkpoint, restore_random, warm_start_routes
+from ..dynamic import drop_cities, insert_cities
+from ..instance_cache import cache_entry
+from ..instrumentation import NO_INSTRUMENTS, resolve
+from ..local_search import LOCAL_SEARCHES
+from ..plotting import PHEROMONE_THRESHOLD, finish, label_points, new_figure, pheromone_collection
+
+PHEROMONE_RESCALE_BELOW = 1e-20  # Evaporation scale at which it is folded back into the stored levels
+CANDIDATE_MATCH_CHUNK = 2**14  # Edges matched against the candidate lists at a time
+CONNECTOR_BATCH_CELLS = 2**22  # Ants x points constructed at once when joining many start points to the tour
+
+
+def kd_tree(points):
+    """Spatial index over the points, or None without scipy (imported here, only candidate-list mode needs it)."""
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:  # Candidate lists fall back to a chunked brute-force search
+        return None
+    return cKDTree(points)
+
+
+class AdaptiveACO:
+    def __init__(self, n_points, n_ants, alpha, beta, evaporation_rate, improvement_threshold=0.001, max_iterations_without_improvement=20, n_candidates=None, points=None, distances=None, local_search=None, improve_ants='best', cache=None):
+        self.n_points = n_points
+        self.n_ants = n_ants
+        self.alpha = alpha
+        self.beta = beta
+        self.evaporation_rate = evaporation_rate
+        self.improvement_threshold = improvement_threshold
+        self.max_iterations_without_improvement = max_iterations_without_improvement
+        self.n_candidates = n_candidates
+
+        self.points = np.random.rand(n_points, 2) if points is None else points  # Randomly generate points unless given
+        self.euclidean = distances is None  # Edge lengths are plain distances between the points, so a KD-tree applies
+        # With cache (an instance_cache.InstanceCache, or this instance's CacheEntry) the matrices below are read
+        # from disk if this network was seen before
+        entry = None
+        self.owns_distances = False  # The matrix may be the caller's or the cache's until the first in-place change
+        if cache is not None:
+            entry = cache_entry(cache, self.points) if distances is None else cache_entry(cache, distances=distances)
+        if n_candidates is None:
+            self.candidates = None
+            self.tree = None
+            if entry is not None:
+                distances = entry.distances()
+            elif distances is None:
+                distances = np.linalg.norm(self.points[:, None] - self.points, axis=2)  # Compute distance matrix
+            self.distances = distances
+            self.pheromones = np.ones((n_points, n_points))  # Initialize pheromones
+            if entry is None:
+                self.heuristic = (1 / (self.distances + 1e-6)) ** self.beta  # Fixed desirability of each edge
+            else:
+                self.heuristic = entry.array(f'heuristic-beta{self.beta:g}', lambda: (1 / (self.distances + 1e-6)) ** self.beta)
+        else:
+            # Candidate-list mode: only the k nearest neighbours of each point are stored, so memory is O(n * k)
+            self.distances = None
+            self.tree = kd_tree(self.points)
+            k = min(n_candidates, n_points - 1)
+            if entry is None:
+                self.candidates, self.candidate_distances = self.nearest_neighbours(k)
+            else:
+                self.candidates, self.candidate_distances = entry.arrays(
+                    (f'candidates-{k}', f'candidate-distances-{k}'), lambda: self.nearest_neighbours(k))
+            self.pheromones = np.ones_like(self.candidate_distances)  # Pheromone of point i -> candidates[i, slot]
+            self.heuristic = (1 / (self.candidate_distances + 1e-6)) ** self.beta
+        self.update_choice_info()
+
+        # Optional local search ('2opt', 'oropt' or 'or2opt') on the iteration-best ant, or on 'all' ants;
+        # a ready LocalSearch built with closed=False over the same distances is used as it is
+        self.local_search = local_search
+        self.improve_ants = improve_ants
+        self.improver = None
+        if local_search is not None:
+            if self.distances is None:
+                raise ValueError("Local search needs the full distance matrix, which candidate-list mode does not keep")
+            if isinstance(local_search, str):
+                # Ant paths are open, so the search leaves the leg back to the start out of every move
+                local_search = (LOCAL_SEARCHES[local_search](self.distances, closed=False) if entry is None
+                                else entry.local_search(local_search, closed=False))
+            self.improver = local_search
+        self.best_path = None
+        self.best_distance = float('inf')
+        self.instruments = NO_INSTRUMENTS  # Set by run()
+
+        # Index of the best path's points and the connector paths found so far, both rebuilt when the tour changes
+        self.indexed_path = None
+        self.tour_tree = None
+        self.connectors = {}
+
+    @property
+    def pheromones(self):
+        """Effective pheromone levels: the stored levels times the evaporation not yet applied to them."""
+        return self.pheromone_levels * self.pheromone_scale
+
+    @pheromones.setter
+    def pheromones(self, levels):
+        self.pheromone_levels = levels  # Kept as given (not copied), so a shared array is updated in place
+        self.pheromone_scale = 1.0
+
+    def run(self, visualize=False, time_limit=None, target=None, callback=print_progress, instruments=None,
+            checkpoint=None, checkpoint_interval=10, resume=None, warm_start=None):
+        """Iterate until the best distance stalls, time_limit seconds pass or it reaches target.
+
+        callback receives a budget.Progress after every iteration (None for no output); instruments
+        (an instrumentation.Instruments) collects phase times, evaluation and move counts and a trace per iteration.
+        With checkpoint (a file path) the state is saved every checkpoint_interval iterations and at the end;
+        resume continues exactly from such a file, warm_start starts from it or from given routes (see warm_start()).
+        visualize=True shows the result; a file path writes the plot there instead (see visualize_result()).
+        Returns the best path and its distance.
+        """
+        budget = Budget(time_limit, target)
+        self.instruments = resolve(instruments)
+        print(f"Finding optimal path among all points")
+
+        iterations_without_improvement = 0
+        iteration = 0
+        if resume is not None:
+            state = load_checkpoint(resume, 'aco', self.n_points)
+            self.restore(state)
+            iteration = state.iteration
+            iterations_without_improvement = state.meta['iterations_without_improvement']
+            restore_random(state)
+        elif warm_start is not None:
+            self.warm_start(warm_start)
+        checkpointer = Checkpointer(checkpoint, checkpoint_interval, 'aco', self.n_points, iteration)
+
+        while iterations_without_improvement < self.max_iterations_without_improvement:
+            iteration += 1
+            ant_paths, ant_distances = self.iterate()
+
+            # Get the best path of this iteration
+            best_iteration_path = ant_paths[np.argmin(ant_distances)]
+            best_iteration_distance = min(ant_distances)
+
+            # Update best path if improvement is made
+            if best_iteration_distance < self.best_distance * (1 - self.improvement_threshold):
+                self.best_path = best_iteration_path
+                self.best_distance = best_iteration_distance
+                iterations_without_improvement = 0
+            else:
+                iterations_without_improvement += 1
+
+            self.instruments.trace(iteration, self.best_distance)
+            checkpointer.step(iteration, *self.checkpoint_state(iterations_without_improvement))
+            if budget.report(callback, iteration, self.best_distance):
+                break
+        checkpointer.close()
+
+        print("\nOptimization Complete")
+        print(f"Optimal Path: {' -> '.join(map(str, self.best_path))}")
+        print(f"Total Distance: {self.best_distance:.2f}")
+        if visualize:
+            self.visualize_result(self.best_path, None if visualize is True else visualize)
+        return self.best_path, self.best_distance
+
+    def checkpoint_state(self, iterations_without_improvement):
+        """Arrays and scalars that checkpoint the search after an iteration (see checkpoint.py)."""
+        arrays = {'pheromone_levels': self.pheromone_levels, 'best_path': self.best_path}
+        meta = {'pheromone_scale': self.pheromone_scale, 'best_distance': float(self.best_distance),
+                'iterations_without_improvement': iterations_without_improvement}
+        return arrays, meta
+
+    def restore(self, state):
+        """Take the pheromones and best path of a checkpoint made on this instance, with the same settings."""
+        levels = state.arrays['pheromone_levels']
+        if levels.shape != self.pheromone_levels.shape:
+            raise ValueError("The checkpoint's pheromones do not fit this colony (candidate-list mode or size differ)")
+        self.pheromones = levels.astype(float)
+        self.pheromone_scale = state.meta['pheromone_scale']
+        self.update_choice_info()
+        if 'best_path' in state.arrays:
+            self.best_path = state.arrays['best_path'].tolist()
+            self.best_distance = state.meta['best_distance']
+
+    def warm_start(self, source):
+        """Start from earlier results: an 'aco' checkpoint's pheromones and best path, or the routes of another
+        solver's checkpoint (or given routes), which become the best path and deposit pheromone."""
+        if is_checkpoint(source):
+            state = load_checkpoint(source, n=self.n_points)
+            if state.solver == 'aco':
+                self.restore(state)
+                return
+        # Tours may start anywhere; ant paths start from point 0
+        paths = [np.roll(route, -int(np.flatnonzero(route == 0)[0])).tolist()
+                 for route in warm_start_routes(source, self.n_points)]
+        distances = [float(self.calculate_distance(path)) for path in paths]
+        best = int(np.argmin(distances))
+        if distances[best] < self.best_distance:
+            self.best_path, self.best_distance = paths[best], distances[best]
+        self.update_pheromones(paths, distances)
+
+    def update_distance(self, a, b, distance, symmetric=True):
+        """Change the length of edge a -> b (and b -> a, unless symmetric=False) in place, e.g. for weather or
+        congestion. Pheromone is reset around a and b only; the next run() continues from the current state."""
+        self.require_matrix("Changing edge lengths")
+        if not self.owns_distances:  # Copied on the first change, so the caller's matrix stays as it was
+            self.distances = np.array(self.distances, dtype=float)
+            self.owns_distances = True
+        self.distances[a, b] = distance
+        if symmetric:
+            self.distances[b, a] = distance
+        self.euclidean = False  # Lengths are no longer the plain distances between the points
+        self.changed([a, b])
+
+    def add_point(self, location, distances=None, incoming=None):
+        """Add a point at location; returns its index, the old n_points.
+
+        Its edges are the Euclidean distances from location, unless distances (to every existing point) and
+        incoming (from them, by default the same) are given. The best path takes it at its cheapest insertion.
+        """
+        self.require_matrix("Adding points")
+        location = np.asarray(location, dtype=float).reshape(1, 2)
+        if distances is None:
+            distances = np.linalg.norm(self.points - location, axis=1)
+        else:
+            self.euclidean = False
+        incoming = distances if incoming is None else incoming
+
+        new = self.n_points
+        self.points = np.vstack((self.points, location))
+        grown = np.zeros((new + 1, new + 1))
+        grown[:new, :new] = self.distances
+        grown[new, :new] = distances
+        grown[:new, new] = incoming
+        self.distances = grown
+        self.owns_distances = True
+        # The new row and column are filled in by changed(); the evaporation scale carries over
+        self.pheromone_levels, self.heuristic, self.choice_info = (
+            np.pad(array, ((0, 1), (0, 1))) for array in (self.pheromone_levels, self.heuristic, self.choice_info))
+        self.n_points += 1
+        if self.best_path is not None:
+            self.best_path = insert_cities(self.best_path, [new], self.distances, closed=False)[0].tolist()
+        self.changed([new])
+        return new
+
+    def remove_point(self, point):
+        """Remove a point; the ones after it move down one index. The best path skips it and starts again
+        from point 0, and the pheromone of the points it joined is reset."""
+        self.require_matrix("Removing points")
+        joined = []
+        if self.best_path is not None:
+            p = self.best_path.index(point)
+            joined = [self.best_path[q] for q in (p - 1, p + 1) if 0 <= q < self.n_points]
+
+        self.points = np.delete(self.points, point, axis=0)
+        self.distances, self.pheromone_levels, self.heuristic, self.choice_info = (
+            np.delete(np.delete(array, point, axis=0), point, axis=1)
+            for array in (self.distances, self.pheromone_levels, self.heuristic, self.choice_info))
+        self.owns_distances = True  # np.delete made new arrays
+        self.n_points -= 1
+        if self.best_path is not None:
+            path = drop_cities(self.best_path, [point])[0]
+            self.best_path = np.roll(path, -int(np.flatnonzero(path == 0)[0])).tolist()
+        self.changed([city - (city > point) for city in joined])
+
+    def require_matrix(self, change):
+        if self.distances is None:
+            raise ValueError(f"{change} needs the full distance matrix, which candidate-list mode does not keep")
+
+    def changed(self, points):
+        """Refresh everything derived from the edges of points after their lengths changed.
+
+        Their pheromone goes back to the mean level of the other edges, so the ants explore around them
+        afresh while the rest of the colony keeps its memory.
+        """
+        points = np.unique(np.asarray(points, dtype=int))
+        others = np.setdiff1d(np.arange(self.n_points), points)
+        mean = self.pheromone_levels[np.ix_(others, others)].mean() if len(others) else 1.0
+        for edges in (points, (slice(None), points)):  # Rows, then columns
+            self.heuristic[edges] = (1 / (self.distances[edges] + 1e-6)) ** self.beta
+            self.pheromone_levels[edges] = mean
+            self.choice_info[edges] = self.pheromone_levels[edges] ** self.alpha * self.heuristic[edges]
+        if self.improver is not None:  # Neighbour lists come from the old lengths; same search, same settings
+            self.improver = self.improver.rebuilt(self.distances)
+        if self.best_path is not None:
+            self.best_distance = float(self.calculate_distance(self.best_path))
+        self.indexed_path = None  # The tour index and connector paths are rebuilt on the next query
+
+    def iterate(self):
+        """One iteration: every ant builds a tour from point 0, the local search (if any) polishes them and
+        they deposit their pheromone. Returns the ants' paths and distances."""
+        instruments = self.instruments
+        with instruments.phase('construct'):
+            ant_paths, ant_distances = self.construct_paths(0)  # All ants start from point 0
+        if self.improver is not None:
+            moves = self.improver.moves
+            with instruments.phase('local_search'):
+                self.improve_paths(ant_paths, ant_distances)
+            instruments.count('local_search_moves', self.improver.moves - moves)
+        with instruments.phase('pheromones'):
+            self.update_pheromones(ant_paths, ant_distances)
+        return ant_paths, ant_distances
+
+    def find_closest_path(self, start, visualize=False):
+        """Find the path from the start point to the closest point on the optimal path"""
+        self.check_points(start)
+        print(f"\nFinding path from Point {start} to closest point on the optimal path.")
+        closest_point = self.find_closest_point_on_optimal_path(start)
+        print(f"Closest point on optimal path: {closest_point}")
+
+        paths, distances = self.find_closest_paths([start])
+        best_iteration_path, best_iteration_distance = paths[0], distances[0]
+
+        print(f"\nOptimal Path from Point {start} to closest point {closest_point}: {' -> '.join(map(str, best_iteration_path))}")
+        print(f"Total Distance: {best_iteration_distance:.2f}")
+        if visualize:
+            self.visualize_result(best_iteration_path, None if visualize is True else visualize)
+
+    def find_closest_paths(self, starts):
+        """Ant-built path from every start point to its closest point on the optimal path, without any output.
+
+        The ants for all queries are constructed together. Paths already found for the current optimal path
+        are reused. Returns the paths and their distances, in the order of starts.
+        """
+        starts = self.check_points(starts)
+        joins = self.closest_points_on_optimal_path(starts)
+        pairs = list(zip(starts.tolist(), joins.tolist()))
+        missing = list(dict.fromkeys(pair for pair in pairs if pair not in self.connectors))
+
+        # Every query gets n_ants ants; as many queries per batch as fit in CONNECTOR_BATCH_CELLS
+        per_batch = max(1, CONNECTOR_BATCH_CELLS // (self.n_ants * self.n_points))
+        for lo in range(0, len(missing), per_batch):
+            batch = np.array(missing[lo:lo + per_batch])
+            ant_paths, ant_distances = self.construct_paths(np.repeat(batch[:, 0], self.n_ants),
+                                                            np.repeat(batch[:, 1], self.n_ants),
+                                                            n_ants=len(batch) * self.n_ants)
+            for k, pair in enumerate(missing[lo:lo + per_batch]):
+                ants = slice(k * self.n_ants, (k + 1) * self.n_ants)
+                best = int(np.argmin(ant_distances[ants]))
+                self.connectors[pair] = (ant_paths[ants][best], ant_distances[ants][best])
+
+        return [self.connectors[pair][0] for pair in pairs], np.array([self.connectors[pair][1] for pair in pairs])
+
+    def check_points(self, points):
+        """points as an index array, after checking that each is a valid point."""
+        points = np.atleast_1d(np.asarray(points, dtype=int))
+        if len(points) and (points.min() < 0 or points.max() >= self.n_points):
+            raise ValueError(f"Invalid start point. It should be between 0 and {self.n_points-1}.")
+        return points
+
+    def construct_path(self, start, end=None):
+        """Constructs a path from start to end, or a full path covering all points if no end is given."""
+        paths, _ = self.construct_paths(start, end, n_ants=1)
+        return paths[0]
+
+    def construct_paths(self, start, end=None, n_ants=None):
+        """Construct the paths of all ants together, one step of every ant per loop iteration.
+
+        start and end may also be arrays with one point per ant.
+        """
+        n_ants = self.n_ants if n_ants is None else n_ants
+        rows = np.arange(n_ants)
+
+        paths = np.empty((n_ants, self.n_points), dtype=int)
+        paths[:, 0] = start
+        visited = np.zeros((n_ants, self.n_points), dtype=bool)  # One visited mask per ant
+        visited[rows, start] = True
+        lengths = np.ones(n_ants, dtype=int)
+        if end is None:
+            active = np.ones(n_ants, dtype=bool)
+        else:
+            end = np.broadcast_to(end, n_ants)
+            active = paths[:, 0] != end
+
+        # Draw every roulette spin up front instead of one np.random.choice call per step
+        spins = np.random.rand(n_ants, self.n_points - 1)
+
+        for step in range(1, self.n_points):
+            if not active.any():
+                break
+            ants = rows[active]
+            current = paths[ants, step - 1]
+
+            weights = self.choice_info[current]
+            if self.candidates is None:
+                weights[visited[ants]] = 0
+            else:
+                options = self.candidates[current]
+                weights[visited[ants[:, None], options]] = 0
+            totals = weights.sum(axis=1)
+
+            stuck = totals == 0  # Edge case where pheromone values are too small
+            if stuck.any() and self.candidates is None:
+                weights[stuck] = ~visited[ants[stuck]]
+                totals[stuck] = weights[stuck].sum(axis=1)
+
+            # Roulette wheel: first point whose cumulative weight exceeds the spin
+            cumulative = np.cumsum(weights, axis=1)
+            next_points = (cumulative <= (spins[ants, step - 1] * totals)[:, None]).sum(axis=1)
+            overflow = next_points >= weights.shape[1]  # Rounding can push the spin past the last bin
+            if overflow.any():
+                next_points[overflow] = weights.shape[1] - 1 - np.argmax(weights[overflow, ::-1] > 0, axis=1)
+
+            if self.candidates is not None:
+                next_points = options[np.arange(len(ants)), next_points]
+                # Every candidate already visited: fall back to the nearest unvisited point of the full set
+                for row in np.flatnonzero(stuck):
+                    next_points[row] = self.nearest_unvisited(current[row], visited[ants[row]])
+
+            paths[ants, step] = next_points
+            visited[ants, next_points] = True
+            lengths[ants] += 1
+            if end is not None:
+                active[ants[next_points == end[ants]]] = False
+
+        self.instruments.count('evaluations', n_ants)
+        with self.instruments.phase('distance'):
+            if end is None:
+                distances = self.edge_lengths(paths[:, :-1], paths[:, 1:]).sum(axis=1)
+                return paths.tolist(), distances.tolist()
+
+            ant_paths = [paths[ant, :lengths[ant]].tolist() for ant in rows]
+            return ant_paths, [self.calculate_distance(path) for path in ant_paths]
+
+    def improve_paths(self, ant_paths, ant_distances):
+        """Run the local search on the iteration-best ant, or on every ant, in place before the pheromone update."""
+        ants = range(len(ant_paths)) if self.improve_ants == 'all' else [int(np.argmin(ant_distances))]
+        for ant in ants:
+            ant_paths[ant] = self.improver.improve(ant_paths[ant])
+            with self.instruments.phase('distance'):
+                ant_distances[ant] = float(self.calculate_distance(ant_paths[ant]))
+        self.instruments.count('evaluations', len(ants))
+
+    def calculate_distance(self, path):
+        """Calculate total distance of a given path."""
+        if len(path) < 2:
+            return 0  # No distance to compute if fewer than 2 points
+        path = np.asarray(path)
+        return self.edge_lengths(path[:-1], path[1:]).sum()
+
+    def edge_lengths(self, a, b):
+        """Length of the edges a -> b, from the distance matrix or, in candidate-list mode, the coordinates."""
+        if self.distances is not None:
+            return self.distances[a, b]
+        return np.linalg.norm(self.points[a] - self.points[b], axis=-1)
+
+    def nearest_neighbours(self, k):
+        """Indices and distances of the k nearest neighbours of every point, closest first."""
+        if self.tree is not None:
+            neighbour_distances, neighbours = self.tree.query(self.points, k=k + 1)
+            return neighbours[:, 1:], neighbour_distances[:, 1:]  # Column 0 is the point itself
+
+        neighbours = np.empty((self.n_points, k), dtype=int)
+        neighbour_distances = np.empty((self.n_points, k))
+        chunk = max(1, 2**20 // self.n_points)  # Keep each block of the distance matrix small
+        for lo in range(0, self.n_points, chunk):
+            rows = np.arange(lo, min(lo + chunk, self.n_points))
+            block = np.linalg.norm(self.points[rows, None] - self.points, axis=2)
+            block[np.arange(len(rows)), rows] = np.inf
+            nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(block, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1)
+            neighbours[rows] = np.take_along_axis(nearest, order, axis=1)
+            neighbour_distances[rows] = np.take_along_axis(nearest_distances, order, axis=1)
+        return neighbours, neighbour_distances
+
+    def nearest_unvisited(self, current, visited):
+        """Closest point to current among those not yet visited."""
+        if self.tree is not None:
+            # Widen the neighbourhood until it reaches an unvisited point, then give up on the index
+            k = 4 * self.candidates.shape[1]
+            while k < self.n_points // 8:
+                _, nearest = self.tree.query(self.points[current], k=k)
+                unvisited = nearest[~visited[nearest]]
+                if len(unvisited):
+                    return unvisited[0]
+                k *= 4
+
+        unvisited = np.flatnonzero(~visited)
+        return unvisited[np.argmin(self.edge_lengths(current, unvisited))]
+
+    def find_closest_point_on_optimal_path(self, start):
+        """Find the closest point on the optimal path to the given start point."""
+        return self.closest_points_on_optimal_path(self.check_points(start))[0]
+
+    def closest_points_on_optimal_path(self, starts):
+        """Closest point on the optimal path to each start: an array of point indices, or an (m, 2) array of
+        arbitrary (x, y) locations, which are measured in straight lines."""
+        starts = np.asarray(starts)
+        locations = starts.ndim == 2
+        path = np.asarray(self.best_path)
+        tree = self.tour_index()
+        if tree is None and locations:
+            tree = kd_tree(self.points[path])  # Not kept: the index is only reused for Euclidean instances
+        if tree is not None:
+            _, nearest = tree.query(starts if locations else self.points[starts])
+            return path[nearest]
+
+        nearest = np.empty(len(starts), dtype=int)
+        chunk = max(1, 2**20 // len(path))  # Keep each block of start-to-tour distances small
+        for lo in range(0, len(starts), chunk):
+            if locations:
+                block = np.linalg.norm(starts[lo:lo + chunk, None] - self.points[path], axis=-1)
+            else:
+                block = self.edge_lengths(starts[lo:lo + chunk, None], path[None, :])
+            nearest[lo:lo + chunk] = np.argmin(block, axis=1)
+        return path[nearest]
+
+    def tour_index(self):
+        """KD-tree over the optimal path's points (None for non-Euclidean distances or without scipy).
+
+        Built once per optimal path; a new optimal path also clears the memoized connector paths.
+        """
+        if self.indexed_path is not self.best_path:
+            self.indexed_path = self.best_path
+            self.tour_tree = kd_tree(self.points[self.best_path]) if self.euclidean else None
+            self.connectors = {}
+        return self.tour_tree
+
+    def update_pheromones(self, ant_paths, ant_distances):
+        """Update pheromones after each iteration.
+
+        Evaporation only shrinks pheromone_scale; deposits are divided by it and scatter-added in one batch,
+        so apart from the occasional rescale only the deposited edges are touched.
+        """
+        self.pheromone_scale *= (1 - self.evaporation_rate)  # Evaporate pheromones
+        rescale = self.pheromone_scale < PHEROMONE_RESCALE_BELOW
+        if rescale:  # Fold the scale back in before the deposits it divides grow too large
+            self.pheromone_levels *= self.pheromone_scale
+            self.pheromone_scale = 1.0
+
+        paths = [np.asarray(path) for path in ant_paths]
+        a = np.concatenate([path[:-1] for path in paths])
+        b = np.concatenate([path[1:] for path in paths])
+        deposits = np.repeat(1 / np.asarray(ant_distances, dtype=float), [len(path) - 1 for path in paths])
+        # Every edge is laid both ways, [i, j] then [j, i], in the order the ants walked them
+        rows = np.column_stack((a, b)).ravel()
+        cols = np.column_stack((b, a)).ravel()
+        deposits = np.repeat(deposits / self.pheromone_scale, 2)
+        if self.candidates is not None:
+            rows, cols, edges = self.candidate_slots(rows, cols)
+            deposits = deposits[edges]
+        np.add.at(self.pheromone_levels, (rows, cols), deposits)
+
+        if rescale:
+            self.update_choice_info()
+        else:
+            self.choice_info[rows, cols] = self.pheromone_levels[rows, cols] ** self.alpha * self.heuristic[rows, cols]
+
+    def candidate_slots(self, a, b):
+        """(row, slot) of the edges a -> b that are in the candidate lists, and which edges those are; others keep none."""
+        edges, slots = [np.empty(0, dtype=int)], [np.empty(0, dtype=int)]
+        for lo in range(0, len(a), CANDIDATE_MATCH_CHUNK):  # Chunks keep the compared candidate rows in cache
+            hi = lo + CANDIDATE_MATCH_CHUNK
+            matches = np.nonzero(self.candidates[a[lo:hi]] == b[lo:hi, None])
+            edges.append(matches[0] + lo)
+            slots.append(matches[1])
+        edges = np.concatenate(edges)
+        return a[edges], np.concatenate(slots), edges
+
+    def update_choice_info(self):
+        """Recompute pheromone**alpha * heuristic in full, from the stored levels.
+
+        The evaporation scale is left out: it multiplies every entry alike, which the roulette wheel ignores.
+        """
+        self.choice_info = self.pheromone_levels ** self.alpha * self.heuristic
+
+    def visualize_result(self, path, output=None, threshold=PHEROMONE_THRESHOLD):
+        """Plot the path over the pheromone edges with at least threshold times the strongest level.
+
+        Shown with pyplot, or written to output (a .png, .svg or .pdf path) without needing a display.
+        """
+        figure = new_figure(output, figsize=(12, 8))
+        ax = figure.add_subplot()
+
+        # Plot all points
+        ax.scatter(self.points[:, 0], self.points[:, 1], c='blue', s=50)
+        label_points(ax, self.points, 'Point')
+
+        # Plot the path
+        path_coords = self.points[path]
+        ax.plot(path_coords[:, 0], path_coords[:, 1], 'r-', linewidth=2, zorder=4)
+
+        # Plot connections between points with pheromone levels, as a single artist
+        ax.add_collection(pheromone_collection(self.points, self.pheromones, threshold, self.candidates, floor=0.1,
+                                               linewidths=0.5, zorder=1))
+
+        ax.set_title("Path Visualization")
+        ax.set_xlabel("X coordinate")
+        ax.set_ylabel("Y coordinate")
+        ax.grid(True, linestyle='--', alpha=0.7)
+        figure.tight_layout()
+        finish(figure, output)
+
+def main():
+    # Example usage
+    n_points = int(input("Enter the number of points: "))
+    n_ants = int(input("Enter the number of ants: "))
+
+    aco = AdaptiveACO(n_points=n_points, n_ants=n_ants, alpha=1, beta=5, evaporation_rate=0.1)
+    aco.run(visualize=True)
+
+    start_point = int(input(f"Enter a starting point (between 0 and {n_points-1}): "))
+    aco.find_closest_path(start_point, visualize=True)
+
+if __name__ == "__main__":
+    main()
+
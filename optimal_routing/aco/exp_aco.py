@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+
+from ..plotting import ANIMATION_WRITERS, PHEROMONE_THRESHOLD, animation_writer, edge_colors, label_points, \
+    new_figure, pheromone_segments, save_animation
+
+class SimpleACO:
+    def __init__(self, n_ports, n_ships, n_iterations, evaporation_rate, ports=None, cache=None):
+        self.n_ports = n_ports
+        self.n_ships = n_ships
+        self.n_iterations = n_iterations
+        self.evaporation_rate = evaporation_rate
+        
+        # Generate random port locations unless given
+        self.ports = np.random.rand(n_ports, 2) if ports is None else np.asarray(ports, dtype=float)
+        
+        # Calculate distances between ports, or read them from cache (an instance_cache.InstanceCache)
+        if cache is None:
+            self.distances = np.linalg.norm(self.ports[:, None] - self.ports, axis=2)
+        else:
+            self.distances = cache.entry(points=self.ports).distances()
+        
+        # Initialize pheromones
+        self.pheromones = np.ones_like(self.distances)
+        
+        # Initialize ships at random ports
+        self.ships = np.random.randint(0, n_ports, n_ships)
+        
+        self.best_path = None
+        self.best_distance = float('inf')
+
+    def move_ships(self):
+        for i in range(self.n_ships):
+            current_port = self.ships[i]
+            next_port = self.choose_next_port(current_port)
+            self.ships[i] = next_port
+            
+            # Update pheromones
+            self.pheromones[current_port, next_port] += 1 / self.distances[current_port, next_port]
+            self.pheromones[next_port, current_port] = self.pheromones[current_port, next_port]
+
+    def choose_next_port(self, current_port):
+        probabilities = self.pheromones[current_port] / self.distances[current_port]
+        probabilities[current_port] = 0  # Can't stay in the same port
+        return np.random.choice(self.n_ports, p=probabilities/sum(probabilities))
+
+    def evaporate_pheromones(self):
+        self.pheromones *= (1 - self.evaporation_rate)
+
+    def update_best_path(self):
+        for ship in range(self.n_ships):
+            path = [self.ships[ship]]
+            for _ in range(self.n_ports - 1):
+                path.append(self.choose_next_port(path[-1]))
+            distance = sum(self.distances[path[i], path[i+1]] for i in range(self.n_ports - 1))
+            if distance < self.best_distance:
+                self.best_path = path
+                self.best_distance = distance
+
+def draw_background(ax, aco):
+    from matplotlib.collections import LineCollection
+
+    # Everything that stays put: drawn once, then restored under every frame
+    ax.scatter(aco.ports[:, 0], aco.ports[:, 1], c='blue', s=100, zorder=2)
+    label_points(ax, aco.ports, 'Port')
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+
+    # The artists that change, updated in place by every frame
+    edges = ax.add_collection(LineCollection([], linewidths=1, zorder=1))
+    ships = ax.scatter(aco.ports[aco.ships, 0], aco.ports[aco.ships, 1], c='red', s=50, zorder=3)
+    best_path, = ax.plot([], [], 'r--', linewidth=2, zorder=4)
+    # Inside the axes, so the blitted region covers it
+    status = ax.text(0.02, 0.98, '', transform=ax.transAxes, va='top', zorder=5,
+                     bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))
+    return edges, ships, best_path, status
+
+def update_artists(i, aco, artists, threshold=PHEROMONE_THRESHOLD):
+    edges, ships, best_path, status = artists
+
+    # Pheromone edges above the threshold, as one collection
+    segments, strength = pheromone_segments(aco.ports, aco.pheromones, threshold)
+    edges.set_segments(segments)
+    edges.set_color(edge_colors(strength, 'g'))
+
+    ships.set_offsets(aco.ports[aco.ships])
+    if aco.best_path:
+        best_path.set_data(aco.ports[aco.best_path, 0], aco.ports[aco.best_path, 1])
+    status.set_text(f'Iteration {i+1}, Best Distance: {aco.best_distance:.2f}')
+    return artists
+
+def animate(i, aco, artists, threshold=PHEROMONE_THRESHOLD):
+    aco.move_ships()
+    aco.evaporate_pheromones()
+    aco.update_best_path()
+    return update_artists(i, aco, artists, threshold)
+
+def main(n_ports=10, n_ships=5, n_iterations=100, output=None, threshold=PHEROMONE_THRESHOLD, fps=5):
+    # output: an .mp4 or .gif file gets every frame, any other image file (.png, ...) the last one;
+    # without it the animation is shown, blitting only the changing artists onto the static background
+    from matplotlib.animation import FuncAnimation
+
+    still = output is not None and os.path.splitext(output)[1].lower() not in ANIMATION_WRITERS
+    if output is not None and not still:
+        animation_writer(output)  # Fail before the run when the writer is missing
+
+    # Create ACO instance
+    aco = SimpleACO(n_ports=n_ports, n_ships=n_ships, n_iterations=n_iterations, evaporation_rate=0.1)
+
+    fig = new_figure(output, figsize=(10, 8))
+    artists = draw_background(fig.add_subplot(), aco)
+    if still:
+        # A still report: run every iteration, draw once
+        for i in range(aco.n_iterations):
+            aco.move_ships()
+            aco.evaporate_pheromones()
+            aco.update_best_path()
+        update_artists(aco.n_iterations - 1, aco, artists, threshold)
+        fig.savefig(output)
+        print(f"Plot written to {output}")
+        return
+
+    # Create animation
+    anim = FuncAnimation(fig, animate, frames=aco.n_iterations, init_func=lambda: artists,
+                         fargs=(aco, artists, threshold), interval=1000 / fps, blit=output is None, repeat=False)
+    if output is None:
+        import matplotlib.pyplot as plt
+
+        plt.show()
+    else:
+        save_animation(anim, output, fps)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .aco_gpt import AdaptiveACO
+from ..budget import Budget, print_progress
+from ..instrumentation import NO_INSTRUMENTS, Instruments, resolve
+
+# Set in every worker by attach_colony(); the shared arrays are mapped, never pickled
+colony = None
+shared_pheromones = None
+_blocks = []
+
+
+def share(array):
+    """Copy array into a new shared memory block; returns the block and a view on it."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    view[:] = array
+    return block, view
+
+
+def attach(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    _blocks.append(block)  # Keep the mapping alive as long as the worker
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def attach_colony(blocks, params):
+    """Pool initializer: build this worker's colony on top of the coordinator's read-only arrays."""
+    global colony, shared_pheromones
+    arrays = {key: attach(*block) for key, block in blocks.items()}
+    colony = AdaptiveACO(**params, points=arrays['points'], distances=arrays.get('distances'))
+    shared_pheromones = arrays['pheromones']
+
+
+def run_colony(seed, iterations, scale, instruments_options=None):
+    """Evolve the colony from the merged pheromones for a few iterations.
+
+    Returns each iteration's best tour, and the colony's instrumentation data when instruments_options is given.
+    """
+    np.random.seed(seed)
+    colony.pheromones = shared_pheromones.copy()
+    colony.pheromone_scale = scale  # The shared block holds the coordinator's levels before its pending evaporation
+    colony.update_choice_info()
+    colony.instruments = NO_INSTRUMENTS if instruments_options is None else Instruments(**instruments_options)
+
+    iteration_bests = []
+    for _ in range(iterations):
+        paths, distances = colony.iterate()
+        best = int(np.argmin(distances))
+        iteration_bests.append((paths[best], distances[best]))
+    colony.instruments.close()
+    return iteration_bests, None if instruments_options is None else colony.instruments.as_dict()
+
+
+class MultiColonyACO(AdaptiveACO):
+    """AdaptiveACO whose ants are split over colonies running in worker processes.
+
+    Every exchange_interval iterations the colonies send their iteration-best tours back, and the
+    coordinator merges them into the shared pheromone matrix that all colonies restart from.
+    """
+
+    def __init__(self, *args, n_colonies=4, exchange_interval=5, max_workers=None, seed=None, **kwargs):
+        if exchange_interval < 1:  # Every round must bring back at least one merged iteration
+            raise ValueError(f"exchange_interval must be at least 1, got {exchange_interval}")
+        super().__init__(*args, **kwargs)
+        self.n_colonies = n_colonies
+        self.exchange_interval = exchange_interval
+        self.max_workers = max_workers
+        self.seed = seed
+
+    def run(self, visualize=False, time_limit=None, target=None, callback=print_progress, instruments=None):
+        """As AdaptiveACO.run; the budget is checked at every merged iteration, so a colony round may overrun it.
+
+        The colonies' phase times and counts are summed over the worker processes and added to instruments,
+        next to the coordinator's own 'colonies' (waiting for a round) and 'merge' phases.
+        """
+        budget = Budget(time_limit, target)
+        instruments = self.instruments = resolve(instruments)
+        print(f"Finding optimal path among all points with {self.n_colonies} colonies")
+
+        arrays = {'points': self.points, 'pheromones': self.pheromones}
+        if self.distances is not None:
+            arrays['distances'] = self.distances
+        shared = {key: share(np.ascontiguousarray(array)) for key, array in arrays.items()}
+        self.pheromones = shared['pheromones'][1]  # Merges below write straight into the shared block
+        blocks = {key: (block.name, view.shape, view.dtype) for key, (block, view) in shared.items()}
+        shared = [block for block, _ in shared.values()]
+        params = dict(n_points=self.n_points, n_ants=math.ceil(self.n_ants / self.n_colonies), alpha=self.alpha,
+                      beta=self.beta, evaporation_rate=self.evaporation_rate, n_candidates=self.n_candidates,
+                      local_search=self.local_search, improve_ants=self.improve_ants)
+        streams = np.random.SeedSequence(self.seed).spawn(self.n_colonies)
+
+        iterations_without_improvement = 0
+        iteration = 0
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers or self.n_colonies, initializer=attach_colony,
+                                     initargs=(blocks, params)) as pool:
+                while iterations_without_improvement < self.max_iterations_without_improvement:
+                    with instruments.phase('colonies'):
+                        futures = [pool.submit(run_colony, int(stream.spawn(1)[0].generate_state(1)[0]),
+                                               self.exchange_interval, self.pheromone_scale, instruments.options())
+                                   for stream in streams]
+                        results = []
+                        for future in futures:
+                            colony_bests, colony_data = future.result()
+                            results.append(colony_bests)
+                            instruments.merge(colony_data)
+
+                    for step in range(self.exchange_interval):
+                        iteration += 1
+                        ant_paths = [colony_bests[step][0] for colony_bests in results]
+                        ant_distances = [colony_bests[step][1] for colony_bests in results]
+
+                        # Early stopping works on the best tour over all colonies
+                        best_iteration_path = ant_paths[np.argmin(ant_distances)]
+                        best_iteration_distance = min(ant_distances)
+                        if best_iteration_distance < self.best_distance * (1 - self.improvement_threshold):
+                            self.best_path = best_iteration_path
+                            self.best_distance = best_iteration_distance
+                            iterations_without_improvement = 0
+                        else:
+                            iterations_without_improvement += 1
+
+                        with instruments.phase('merge'):
+                            self.update_pheromones(ant_paths, ant_distances)
+
+                        instruments.trace(iteration, self.best_distance)
+                        stop = budget.report(callback, iteration, self.best_distance)
+                        if stop or iterations_without_improvement >= self.max_iterations_without_improvement:
+                            break
+                    if stop:
+                        break
+        finally:
+            self.pheromones = self.pheromones.copy()  # Drop the last view so the blocks can be released
+            self.update_choice_info()
+            for block in shared:
+                block.close()
+                block.unlink()
+
+        print("\nOptimization Complete")
+        print(f"Optimal Path: {' -> '.join(map(str, self.best_path))}")
+        print(f"Total Distance: {self.best_distance:.2f}")
+        if visualize:
+            self.visualize_result(self.best_path, None if visualize is True else visualize)
+        return self.best_path, self.best_distance
+
+
+def main():
+    n_points = int(input("Enter the number of points: "))
+    n_ants = int(input("Enter the number of ants: "))
+    n_colonies = int(input("Enter the number of colonies: "))
+
+    aco = MultiColonyACO(n_points=n_points, n_ants=n_ants, alpha=1, beta=5, evaporation_rate=0.1, n_colonies=n_colonies)
+    aco.run(visualize=True)
+
+
+if __name__ == "__main__":
+    main()
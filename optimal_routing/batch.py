@@ -0,0 +1,116 @@
+"""Many small, independent instances solved together: a stacked (batch, n, n) array of distance matrices in,
+every instance's best closed tour and its length out.
+
+Up to EXHAUSTIVE_MAX_CITIES cities, every tour of every instance is enumerated; up to exact.EXACT_MAX_CITIES,
+Held-Karp solves the whole stack at once. Both are exact. Larger instances go to a GA whose population is one
+(batch, population, n) array. Each generation selects, crosses and mutates the routes of all instances at once
+with the batched operators of ga.operators, so the Python overhead is paid once per generation instead of once
+per instance and generation.
+"""
+import itertools
+
+import numpy as np
+
+from .exact import EXACT_MAX_CITIES, held_karp_batch
+from .ga.operators import ordered_crossover, random_routes, reverse_mutation, swap_mutation
+
+EXHAUSTIVE_MAX_CITIES = 6  # Up to here enumerating all (n - 1)! tours from city 0 beats Held-Karp
+GATHER_CELLS = 2**24  # Matrix entries gathered at a time while enumerating
+POPULATION_SIZE = 60  # With GENERATIONS, ~1/4 of the per-instance loop's time for shorter tours (benchmark --batch)
+GENERATIONS = 30
+MUTATION_RATE = 0.5
+ELITISM = 2
+TOURNAMENT_SIZE = 3
+
+
+def route_lengths(matrices, routes):
+    """Closed-tour length of every route; routes[b] holds one route, or a row of routes, on matrices[b]."""
+    instances = np.arange(len(matrices)).reshape((-1,) + (1,) * (routes.ndim - 1))
+    return matrices[instances, routes, np.roll(routes, -1, axis=-1)].sum(axis=-1)
+
+
+def start_at_first_city(routes):
+    """The same closed tours, each rotated to start at city 0."""
+    n = routes.shape[1]
+    shift = np.argmax(routes == 0, axis=1)[:, None]
+    return np.take_along_axis(routes, (shift + np.arange(n)) % n, axis=1)
+
+
+def solve_exhaustive(matrices):
+    """Optimal tours by enumeration, all starting at city 0."""
+    batch, n = matrices.shape[:2]
+    tails = np.array(list(itertools.permutations(range(1, n))), dtype=np.intp)
+    tours = np.hstack((np.zeros((len(tails), 1), dtype=np.intp), tails))
+    following = np.roll(tours, -1, axis=1)
+
+    routes = np.empty((batch, n), dtype=np.intp)
+    lengths = np.empty(batch)
+    chunk = max(1, GATHER_CELLS // tours.size)
+    for lo in range(0, batch, chunk):
+        hi = min(lo + chunk, batch)
+        tour_lengths = matrices[lo:hi][:, tours, following].sum(axis=2)  # (instances, tours)
+        best = np.argmin(tour_lengths, axis=1)
+        routes[lo:hi] = tours[best]
+        lengths[lo:hi] = tour_lengths[np.arange(hi - lo), best]
+    return routes, lengths
+
+
+def solve_genetic(matrices, population_size=POPULATION_SIZE, generations=GENERATIONS, mutation_rate=MUTATION_RATE,
+                  elitism=ELITISM):
+    """Best tours a GA finds, all instances evolving side by side: tournament selection within each instance,
+    ordered crossover, swap or reversal mutation, and the elitism best routes of each instance kept."""
+    batch, n = matrices.shape[:2]
+    n_children = population_size - elitism
+    instances = np.arange(batch)[:, None]
+    population = random_routes(batch * population_size, n).reshape(batch, population_size, n)
+    lengths = route_lengths(matrices, population)
+
+    for _ in range(generations):
+        order = np.argsort(lengths, axis=1, kind='stable')[:, :elitism]
+        elites = population[instances, order]
+
+        # The shortest of TOURNAMENT_SIZE random routes of the same instance, for every parent
+        contestants = np.random.randint(0, population_size, (batch, 2 * n_children, TOURNAMENT_SIZE))
+        winners = np.argmin(lengths[instances[..., None], contestants], axis=2)
+        parents = population[instances, np.take_along_axis(contestants, winners[..., None], axis=2)[..., 0]]
+
+        # Row-wise operators, so every instance's parent pairs go through them as one flat batch of rows
+        children = ordered_crossover(parents[:, 0::2].reshape(-1, n), parents[:, 1::2].reshape(-1, n))
+        mutating = np.flatnonzero(np.random.rand(len(children)) < mutation_rate)
+        swapped = np.random.rand(len(mutating)) < 0.5
+        swap_mutation(children, mutating[swapped])
+        reverse_mutation(children, mutating[~swapped])
+        children = children.reshape(batch, n_children, n)
+
+        population = np.concatenate((elites, children), axis=1)
+        lengths = np.concatenate((lengths[instances, order], route_lengths(matrices, children)), axis=1)
+
+    best = np.argmin(lengths, axis=1)
+    return start_at_first_city(population[np.arange(batch), best]), lengths[np.arange(batch), best]
+
+
+METHODS = {
+    'exhaustive': solve_exhaustive,
+    'held_karp': held_karp_batch,
+    'genetic': solve_genetic,
+}
+
+
+def auto_method(n):
+    if n <= EXHAUSTIVE_MAX_CITIES:
+        return 'exhaustive'
+    return 'held_karp' if n <= EXACT_MAX_CITIES else 'genetic'
+
+
+def solve_batch(matrices, method='auto', **options):
+    """Best routes, a (batch, n) array, and their closed-tour lengths for a (batch, n, n) stack of matrices.
+
+    method is 'exhaustive', 'held_karp', 'genetic' (options go to solve_genetic) or 'auto': exhaustive up to
+    EXHAUSTIVE_MAX_CITIES cities, held_karp up to exact.EXACT_MAX_CITIES, genetic beyond.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+        raise ValueError(f"Expected a (batch, n, n) stack of distance matrices, got shape {matrices.shape}")
+    if method == 'auto':
+        method = auto_method(matrices.shape[1])
+    return METHODS[method](matrices, **options)
@@ -0,0 +1,468 @@
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from .cli import add_benchmark_arguments
+from .exact import HELD_KARP_MAX_CITIES, held_karp
+from .ga.distance_matrix import DistanceMatrix
+from .instances import Instance, load_instance
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak memory is then left out
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TSPLIB_DIR = os.path.join(ROOT, 'data', 'tsplib')
+
+# Proven optimal tour lengths of the TSPLIB instances the suite picks up when their files are present
+KNOWN_OPTIMA = {
+    'burma14': 3323, 'ulysses16': 6859, 'ulysses22': 7013, 'att48': 10628, 'eil51': 426,
+    'berlin52': 7542, 'st70': 675, 'eil76': 538, 'pr76': 108159, 'kroA100': 21282, 'eil101': 629,
+    'ch130': 6110, 'ch150': 6528, 'a280': 2579, 'pcb442': 50778, 'pr1002': 259045, 'pr2392': 378032,
+}
+
+# Sizes of the seeded random instances, and the largest TSPLIB instance each suite includes
+SUITES = {
+    'quick': {'sizes': (10, 50, 100), 'max_tsplib_n': 100},
+    'full': {'sizes': (10, 50, 200, 1000, 3000), 'max_tsplib_n': 3000},
+}
+TARGET_GAPS = (0.10, 0.05, 0.01)  # Reported as the time at which the best tour first came within each gap
+ACO_DENSE_MAX_N = 500  # Larger instances run AdaptiveACO in candidate-list mode
+GA_MAX_N = 1000  # ga2 and exp 2-opt every child in Python: about a minute per run at 1000 cities, one core
+LOCAL_SEARCH_MAX_N = 1000  # Local search keeps the whole matrix as nested lists
+TOLERANCE = 0.2  # Relative change against the baseline that counts as a regression
+MIN_TIME_DELTA = 0.05  # Seconds; timing differences below this are noise
+# Modules whose cold-start import time is measured; short-lived workers pay it on every spawn
+IMPORT_MODULES = ('optimal_routing', 'optimal_routing.aco.aco_gpt', 'optimal_routing.aco.multi_colony',
+                  'optimal_routing.ga.exp', 'optimal_routing.de.de_gpt', 'optimal_routing.instances')
+IMPORT_REPEATS = 5
+BATCH_SIZES = (6, 8, 12, 20)  # Cities per instance in the batch throughput benchmark
+BATCH_INSTANCES = 1000
+LOOP_INSTANCES = 30  # The per-instance loop is timed on the first this many instances only
+
+
+class Probe:
+    """Counts full-tour evaluations and timestamps every improvement of the best closed-tour length."""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.evaluations = 0
+        self.best_length = float('inf')
+        self.trajectory = []
+        self.started = time.perf_counter()
+
+    def restart(self):
+        """Start the clock; called by the runners once the solver modules are imported."""
+        self.started = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def record(self, length):
+        self.evaluations += 1
+        if length < self.best_length:
+            self.best_length = length
+            self.trajectory.append((self.elapsed(), length))
+
+    def record_many(self, lengths):
+        self.evaluations += len(lengths)
+        best = float(np.min(lengths))
+        if best < self.best_length:
+            self.best_length = best
+            self.trajectory.append((self.elapsed(), best))
+
+    def record_routes(self, routes):
+        routes = np.asarray(routes)
+        self.record_many(self.matrix[routes, np.roll(routes, -1, axis=1)].sum(axis=1))
+
+
+class ProbedNetwork(DistanceMatrix):
+    """DistanceMatrix that reports every route length it computes to a probe."""
+
+    def __init__(self, matrix, probe):
+        super().__init__(range(len(matrix)), matrix)
+        self.probe = probe
+
+    def route_length(self, route):
+        length = super().route_length(route)
+        self.probe.record(length)
+        return length
+
+    def route_lengths(self, routes):
+        lengths = super().route_lengths(routes)
+        self.probe.record_many(lengths)
+        return lengths
+
+
+def aco_runner(**options):
+    """Runner for AdaptiveACO; options (e.g. local_search) are passed on to its constructor."""
+    def run_aco(instance, matrix, probe):
+        from .aco.aco_gpt import AdaptiveACO
+
+        probe.restart()
+        n = instance.n
+        points = instance.points if instance.points is not None else np.random.rand(n, 2)
+        small = n <= ACO_DENSE_MAX_N
+        aco = AdaptiveACO(n, n_ants=20, alpha=1, beta=5, evaporation_rate=0.1,
+                          improvement_threshold=0.001 if small else 0.01,
+                          max_iterations_without_improvement=20 if small else 5,
+                          n_candidates=None if small else 15, points=np.asarray(points, dtype=float),
+                          distances=matrix if small else None, **options)
+
+        update_pheromones = aco.update_pheromones
+
+        def counted_update(paths, distances):
+            probe.record_routes(paths)  # The colony reports open paths, the probe scores them as closed tours
+            update_pheromones(paths, distances)
+
+        aco.update_pheromones = counted_update
+        aco.run()
+
+    return run_aco
+
+
+def ga_runner(variant, **options):
+    """Runner for one of the GA variants; options are passed on to its genetic_algorithm()."""
+    def run_ga(instance, matrix, probe):
+        module = importlib.import_module(f'.ga.{variant}', __package__)
+        probe.restart()
+        module.genetic_algorithm(ProbedNetwork(matrix, probe), **options)
+
+    return run_ga
+
+
+def de_runner(**options):
+    """Runner for differential_evolution; options (e.g. local_search) are passed on to it."""
+    def run_de(instance, matrix, probe):
+        from .de import de_gpt
+
+        fitness = de_gpt.fitness
+
+        def counted_fitness(population, distances=matrix):
+            lengths = fitness(population, distances)
+            probe.record_many(lengths)
+            return lengths
+
+        de_gpt.fitness = counted_fitness
+        probe.restart()
+        de_gpt.differential_evolution(matrix, **options)
+
+    return run_de
+
+
+SOLVERS = {
+    'aco': (aco_runner(), None),
+    'aco-or2opt': (aco_runner(local_search='or2opt'), ACO_DENSE_MAX_N),  # Local search needs the dense matrix
+    'ga': (ga_runner('ga'), GA_MAX_N),
+    'ga1': (ga_runner('ga1', population_size=100, generations=100), GA_MAX_N),
+    'ga2': (ga_runner('ga2', generations=100), GA_MAX_N),
+    'exp': (ga_runner('exp', generations=100), GA_MAX_N),
+    'de': (de_runner(), None),
+    'de-or2opt': (de_runner(local_search='or2opt'), LOCAL_SEARCH_MAX_N),
+}
+
+
+def random_instance(n, seed):
+    """n points uniform in a 1000 x 1000 square, the same for every run with this seed."""
+    points = np.random.default_rng(seed).random((n, 2)) * 1000
+    return Instance(f"random-{n}", points=points, edge_weight_type='EUC')
+
+
+def build_instance(spec):
+    if spec['kind'] == 'random':
+        return random_instance(spec['n'], spec['seed'])
+    return load_instance(spec['path'])
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10  # Bytes on macOS, kilobytes elsewhere
+
+
+def run_case(case):
+    """Run one solver on one instance; executed in a fresh process so peak memory belongs to this run alone."""
+    os.environ['MPLBACKEND'] = 'Agg'
+    instance = build_instance(case['instance'])
+    matrix = np.ascontiguousarray(instance.distance_matrix(), dtype=float)
+    random.seed(case['seed'])
+    np.random.seed(case['seed'])
+    run, _ = SOLVERS[case['solver']]
+
+    probe = Probe(matrix)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        run(instance, matrix, probe)
+    wall_time = probe.elapsed()
+
+    return {
+        'solver': case['solver'],
+        'instance': instance.name,
+        'n': instance.n,
+        'seed': case['seed'],
+        'optimum': case.get('optimum'),
+        'wall_time': wall_time,
+        'evaluations': probe.evaluations,
+        'evaluations_per_second': probe.evaluations / wall_time if wall_time > 0 else None,
+        'peak_memory_mb': peak_memory_mb(),
+        'best_length': probe.best_length,
+        'trajectory': probe.trajectory,
+    }
+
+
+def exact_optimum(instance):
+    """Optimal tour length by Held-Karp, for instances small enough for it; None otherwise."""
+    if instance.n > HELD_KARP_MAX_CITIES:
+        return None
+    return held_karp(instance.distance_matrix())[1]
+
+
+def suite_cases(suite, solvers, seed, tsplib_dir):
+    """Instance specs for the suite: seeded random instances, then the TSPLIB files with a known optimum.
+
+    Instances of up to HELD_KARP_MAX_CITIES cities are solved exactly first, so they always have an optimum.
+    """
+    instances = []
+    for n in SUITES[suite]['sizes']:
+        spec = {'kind': 'random', 'n': n, 'seed': seed}
+        instances.append((spec, n, exact_optimum(build_instance(spec))))
+    if tsplib_dir and os.path.isdir(tsplib_dir):
+        for filename in sorted(os.listdir(tsplib_dir)):
+            name, extension = os.path.splitext(filename)
+            if extension == '.tsp':
+                path = os.path.join(tsplib_dir, filename)
+                instance = load_instance(path)
+                optimum = KNOWN_OPTIMA.get(name) or exact_optimum(instance)
+                if optimum is not None and instance.n <= SUITES[suite]['max_tsplib_n']:
+                    instances.append(({'kind': 'tsplib', 'path': path}, instance.n, optimum))
+
+    return [
+        {'solver': solver, 'instance': spec, 'seed': seed, 'optimum': optimum}
+        for spec, n, optimum in instances
+        for solver in solvers
+        if SOLVERS[solver][1] is None or n <= SOLVERS[solver][1]
+    ]
+
+
+def add_gaps(results):
+    """Final gap and time-to-target-gap of every result.
+
+    Gaps are measured from the optimum, known or solved by Held-Karp, or else from the best tour any solver found.
+    """
+    best_found = {}
+    for result in results:
+        best_found[result['instance']] = min(best_found.get(result['instance'], float('inf')), result['best_length'])
+
+    for result in results:
+        reference = result['optimum'] or best_found[result['instance']]
+        result['gap_reference'] = 'optimum' if result['optimum'] else 'best_found'
+        result['gap'] = round(result['best_length'] / reference - 1, 9) + 0.0  # No -0.0 from rounding noise
+        result['time_to_target'] = {
+            f"{gap:.0%}": next((t for t, length in result['trajectory'] if length <= reference * (1 + gap)), None)
+            for gap in TARGET_GAPS
+        }
+    return results
+
+
+def run_benchmark(suite='quick', solvers=None, seed=0, tsplib_dir=TSPLIB_DIR):
+    results = []
+    for case in suite_cases(suite, solvers or list(SOLVERS), seed, tsplib_dir):
+        # A new spawned process per case: clean module state and a peak RSS that only this run contributes to
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(run_case, case).result()
+        results.append(result)
+        print(f"{result['solver']:<11}{result['instance']:<14}{result['wall_time']:>10.2f}s"
+              f"{result['best_length']:>14.1f}", flush=True)
+    return add_gaps(results)
+
+
+def random_matrices(batch, n, seed):
+    """batch asymmetric matrices like the GA demos' waypoint tables: legs of 50 to 200 in each direction."""
+    matrices = np.random.default_rng(seed).integers(50, 201, (batch, n, n)).astype(float)
+    matrices[:, np.arange(n), np.arange(n)] = 0
+    return matrices
+
+
+def run_batch_benchmark(sizes=BATCH_SIZES, batch=BATCH_INSTANCES, seed=0):
+    """Instances per second of batch.solve_batch against a loop of ga.genetic_algorithm() calls, per size.
+
+    Mean lengths are over the instances both solved, so throughput is compared at the quality each reaches.
+    """
+    from .batch import auto_method, solve_batch
+    from .ga import ga
+
+    results = []
+    for n in sizes:
+        matrices = random_matrices(batch, n, seed)
+        random.seed(seed)
+        np.random.seed(seed)
+        started = time.perf_counter()
+        _, lengths = solve_batch(matrices)
+        batch_time = time.perf_counter() - started
+
+        loop_lengths = []
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for matrix in matrices[:LOOP_INSTANCES]:
+                network = DistanceMatrix(range(n), matrix)
+                loop_lengths.append(network.route_length(ga.genetic_algorithm(network, callback=None)))
+        loop_time = time.perf_counter() - started
+
+        results.append({
+            'n': n,
+            'instances': batch,
+            'method': auto_method(n),
+            'batch_per_second': batch / batch_time,
+            'loop_per_second': LOOP_INSTANCES / loop_time,
+            'speedup': (batch / batch_time) / (LOOP_INSTANCES / loop_time),
+            'batch_mean_length': float(lengths[:LOOP_INSTANCES].mean()),
+            'loop_mean_length': float(np.mean(loop_lengths)),
+        })
+        print(f"batch n={n:<4}{results[-1]['batch_per_second']:>12.0f}/s  loop {results[-1]['loop_per_second']:>8.1f}/s",
+              flush=True)
+    return results
+
+
+def measure_import_time(module, repeat=IMPORT_REPEATS):
+    """Best-of-repeat time to import module in a fresh interpreter, and whether that pulled in matplotlib."""
+    script = (f"import sys, time; started = time.perf_counter(); import {module}; "
+              f"print(time.perf_counter() - started, 'matplotlib' in sys.modules)")
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.split()
+        timings.append(float(output[0]))
+    return {'seconds': min(timings), 'loads_matplotlib': output[1] == 'True'}
+
+
+def measure_import_times(modules=IMPORT_MODULES):
+    return {module: measure_import_time(module) for module in modules}
+
+
+def case_key(result):
+    return result['solver'], result['instance'], result['seed']
+
+
+def compare(report, baseline, tolerance=TOLERANCE):
+    """Regressions of a report against a baseline report, as readable messages."""
+    previous = {case_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        label = '/'.join(map(str, case_key(result)))
+        if result['wall_time'] > old['wall_time'] * (1 + tolerance) and \
+                result['wall_time'] - old['wall_time'] > MIN_TIME_DELTA:
+            regressions.append(f"{label}: wall time {old['wall_time']:.2f}s -> {result['wall_time']:.2f}s")
+        if old['evaluations_per_second'] and result['evaluations_per_second'] is not None and \
+                result['evaluations_per_second'] < old['evaluations_per_second'] * (1 - tolerance) and \
+                result['wall_time'] > MIN_TIME_DELTA:
+            regressions.append(f"{label}: evaluations/s {old['evaluations_per_second']:.0f} -> "
+                               f"{result['evaluations_per_second']:.0f}")
+        if old['peak_memory_mb'] and result['peak_memory_mb'] and \
+                result['peak_memory_mb'] > old['peak_memory_mb'] * (1 + tolerance):
+            regressions.append(f"{label}: peak memory {old['peak_memory_mb']:.1f}MB -> {result['peak_memory_mb']:.1f}MB")
+        if result['best_length'] > old['best_length'] * (1 + tolerance / 10):
+            regressions.append(f"{label}: best length {old['best_length']:.1f} -> {result['best_length']:.1f}")
+
+    old_imports = baseline.get('import_times', {})
+    for module, timing in report.get('import_times', {}).items():
+        old = old_imports.get(module)
+        if old is None:
+            continue
+        if timing['seconds'] > old['seconds'] * (1 + tolerance) and timing['seconds'] - old['seconds'] > MIN_TIME_DELTA / 5:
+            regressions.append(f"import {module}: {old['seconds'] * 1000:.0f}ms -> {timing['seconds'] * 1000:.0f}ms")
+        if timing['loads_matplotlib'] and not old['loads_matplotlib']:
+            regressions.append(f"import {module}: now loads matplotlib")
+
+    old_batch = {result['n']: result for result in baseline.get('batch', [])}
+    for result in report.get('batch', []):
+        old = old_batch.get(result['n'])
+        if old is not None and result['batch_per_second'] < old['batch_per_second'] * (1 - tolerance):
+            regressions.append(f"batch n={result['n']}: instances/s {old['batch_per_second']:.0f} -> "
+                               f"{result['batch_per_second']:.0f}")
+    return regressions
+
+
+def print_summary(results):
+    targets = [f"{gap:.0%}" for gap in TARGET_GAPS]
+    print(f"\n{'Solver':<11}{'Instance':<14}{'n':>6}{'Time (s)':>10}{'Evals/s':>11}{'Peak MB':>9}"
+          f"{'Best':>13}{'Gap':>10}" + ''.join(f"{'t@' + target:>9}" for target in targets))
+    for result in results:
+        times = ''.join(f"{'-' if result['time_to_target'][target] is None else format(result['time_to_target'][target], '.2f'):>9}"
+                        for target in targets)
+        peak = '-' if result['peak_memory_mb'] is None else f"{result['peak_memory_mb']:.0f}"
+        rate = '-' if result['evaluations_per_second'] is None else f"{result['evaluations_per_second']:.0f}"
+        gap = f"{result['gap']:.1%}" + ('' if result['gap_reference'] == 'optimum' else '*')
+        print(f"{result['solver']:<11}{result['instance']:<14}{result['n']:>6}{result['wall_time']:>10.2f}"
+              f"{rate:>11}{peak:>9}{result['best_length']:>13.1f}{gap:>10}{times}")
+    print("* gap to the best tour found by any solver (no known optimum)")
+
+
+def print_import_times(import_times):
+    print(f"\n{'Module':<36}{'Import (ms)':>12}  Matplotlib")
+    for module, timing in import_times.items():
+        print(f"{module:<36}{timing['seconds'] * 1000:>12.1f}  {'yes' if timing['loads_matplotlib'] else 'no'}")
+
+
+def print_batch_summary(results):
+    print(f"\n{'n':>4}  {'Method':<11}{'Batch/s':>10}{'Loop/s':>9}{'Speedup':>9}{'Batch mean':>12}{'Loop mean':>11}")
+    for result in results:
+        print(f"{result['n']:>4}  {result['method']:<11}{result['batch_per_second']:>10.0f}{result['loop_per_second']:>9.1f}"
+              f"{result['speedup']:>8.0f}x{result['batch_mean_length']:>12.1f}{result['loop_mean_length']:>11.1f}")
+
+
+def main(args):
+    """Run the suite for parsed cli.add_benchmark_arguments() options."""
+    tsplib_dir = TSPLIB_DIR if args.tsplib_dir is None else args.tsplib_dir
+    results = [] if args.imports_only else run_benchmark(args.suite, args.solvers, args.seed, tsplib_dir)
+    if results:
+        print_summary(results)
+    batch = run_batch_benchmark(seed=args.seed) if args.batch else []
+    if batch:
+        print_batch_summary(batch)
+    import_times = measure_import_times()
+    print_import_times(import_times)
+
+    report = {
+        'suite': args.suite,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'import_times': import_times,
+        'results': results,
+        'batch': batch,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), TOLERANCE if args.tolerance is None else args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ACO, GA and DE solvers on seeded and TSPLIB instances")
+    add_benchmark_arguments(parser)
+    main(parser.parse_args())
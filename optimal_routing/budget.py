@@ -0,0 +1,39 @@
+"""Stopping rules and progress reports shared by the solvers.
+
+Every solver takes time_limit (seconds of wall-clock time), target (a tour length that is good enough)
+and callback (called with a Progress after each iteration). Both limits are checked between iterations,
+and the solver returns its best tour so far once either is reached.
+"""
+import time
+from collections import namedtuple
+
+Progress = namedtuple('Progress', ['iteration', 'best_length', 'elapsed'])
+
+
+def print_progress(progress):
+    """Default callback: one short line per iteration, without the tour itself."""
+    print(f"Iteration {progress.iteration}: best length {progress.best_length:.2f} ({progress.elapsed:.2f} s)")
+
+
+class Budget:
+    """Wall-clock deadline and target length of one solver run; either may be None."""
+
+    def __init__(self, time_limit=None, target=None):
+        self.time_limit = time_limit
+        self.target = target
+        self.start = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def exhausted(self, best_length):
+        """True once the target length is reached or the time is up."""
+        if self.target is not None and best_length <= self.target:
+            return True
+        return self.time_limit is not None and self.elapsed() >= self.time_limit
+
+    def report(self, callback, iteration, best_length):
+        """Send this iteration's progress to callback (if any); returns whether the run should stop."""
+        if callback is not None:
+            callback(Progress(iteration, best_length, self.elapsed()))
+        return self.exhausted(best_length)
@@ -0,0 +1,142 @@
+"""Checkpoints of solver state in compressed .npz files, for resuming runs and warm-starting new ones.
+
+A checkpoint holds the solver's arrays (pheromones, a population, the best route, ...), a few scalars and
+the state of numpy's and Python's global random generators, taken at the end of an iteration. Resuming
+restores all of it and continues with the next iteration, so it matches the run that was never stopped.
+Warm-starting only takes the search state (pheromones or routes) and starts a fresh run from it.
+Wherever a checkpoint path is taken, a dict also works: the checkpoint is then kept in it, in memory.
+"""
+import json
+import os
+import random
+from collections import namedtuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+BEST_ROUTE_NAMES = ('best_path', 'best_route', 'best_solution')  # What the ACO, GA and DE checkpoints call it
+
+Checkpoint = namedtuple('Checkpoint', ['solver', 'iteration', 'arrays', 'meta'])
+
+
+def capture_random():
+    """Arrays and scalars describing the current state of numpy's and Python's global random generators."""
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    version, python_state, gauss_next = random.getstate()
+    arrays = {'numpy_random': keys, 'python_random': np.array(python_state, dtype=np.uint32)}
+    meta = {'numpy_random': [int(pos), int(has_gauss), float(cached_gaussian)],
+            'python_random': [version, gauss_next]}
+    return arrays, meta
+
+
+def restore_random(checkpoint):
+    """Put both global random generators back in the state the checkpoint was taken in."""
+    pos, has_gauss, cached_gaussian = checkpoint.meta['numpy_random']
+    np.random.set_state(('MT19937', checkpoint.arrays['numpy_random'], pos, has_gauss, cached_gaussian))
+    version, gauss_next = checkpoint.meta['python_random']
+    random.setstate((version, tuple(int(x) for x in checkpoint.arrays['python_random']), gauss_next))
+
+
+def save_checkpoint(path, solver, iteration, n, arrays, meta=None, random_state=None):
+    """Write a checkpoint to path, replacing any earlier one only once the new file is complete.
+
+    arrays maps names to array-likes (None values are left out); meta holds JSON-able scalars;
+    random_state is a capture_random() result, taken now if not given.
+    """
+    random_arrays, random_meta = capture_random() if random_state is None else random_state
+    header = {'format': FORMAT_VERSION, 'solver': solver, 'iteration': iteration, 'n': n, **random_meta,
+              'meta': meta or {}}
+    contents = {name: np.asarray(array) for name, array in arrays.items() if array is not None}
+    contents.update(random_arrays)
+    if isinstance(path, dict):
+        path.clear()
+        path.update(header=header, arrays={name: array.copy() for name, array in contents.items()})
+        return
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:  # A file object keeps np.savez from appending .npz to the name
+        np.savez_compressed(file, header=np.array(json.dumps(header)), **contents)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path, solver=None, n=None):
+    """Read a checkpoint; raises ValueError if it belongs to another solver or another number of cities."""
+    name = "in-memory checkpoint" if isinstance(path, dict) else path
+    if isinstance(path, dict):
+        header, arrays = path['header'], dict(path['arrays'])
+    else:
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data['header']))
+            arrays = {name: data[name] for name in data.files if name != 'header'}
+    if header.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{name}: unsupported checkpoint format {header.get('format')}")
+    if solver is not None and header['solver'] != solver:
+        raise ValueError(f"{name} is a {header['solver']} checkpoint, not {solver}")
+    if n is not None and header['n'] != n:
+        raise ValueError(f"{name} was saved for {header['n']} cities, not {n}")
+    meta = dict(header['meta'], numpy_random=header['numpy_random'], python_random=header['python_random'])
+    return Checkpoint(header['solver'], header['iteration'], arrays, meta)
+
+
+def warm_start_routes(source, n):
+    """Routes to start from, one per row: a checkpoint's best route and population, best first, or the given route(s)."""
+    if is_checkpoint(source):
+        arrays = load_checkpoint(source, n=n).arrays
+        routes = [arrays[name][None, :] for name in BEST_ROUTE_NAMES if name in arrays]
+        if 'population' in arrays:
+            population = arrays['population']
+            if 'scores' in arrays:  # GA fitness, higher is better
+                population = population[np.argsort(-arrays['scores'], kind='stable')]
+            elif 'population_fitness' in arrays:  # DE tour lengths
+                population = population[np.argsort(arrays['population_fitness'], kind='stable')]
+            routes.append(population)
+        routes = np.concatenate(routes)
+    else:
+        routes = np.atleast_2d(np.asarray(source))
+    if routes.shape[1] != n:
+        raise ValueError(f"Warm-start routes visit {routes.shape[1]} cities, not {n}")
+    return routes
+
+
+def is_checkpoint(source):
+    """Whether source names a checkpoint (a path, or an in-memory dict) rather than holding routes."""
+    return isinstance(source, (str, os.PathLike, dict))
+
+
+def seed_population(population, source):
+    """Overwrite the first rows of population with the warm-start routes from source (see warm_start_routes)."""
+    routes = warm_start_routes(source, population.shape[1])[:len(population)]
+    population[:len(routes)] = routes
+    return population
+
+
+class Checkpointer:
+    """Saves a solver's state every interval iterations and once more when the run ends; inactive without a path.
+
+    step() is called wherever the run could be resumed from. Its arrays are only referenced, so the solver
+    must not change them in place before the next step() or close().
+    """
+
+    def __init__(self, path, interval, solver, n, start=0):
+        self.path = path
+        self.interval = interval
+        self.solver = solver
+        self.n = n
+        self.saved = start  # Iteration of the newest file (or of the run's start)
+        self.latest = None
+
+    def step(self, iteration, arrays, meta=None):
+        if self.path is None:
+            return
+        self.latest = (iteration, arrays, meta, capture_random())
+        if iteration - self.saved >= self.interval:
+            self.write()
+
+    def close(self):
+        """Save the last step, unless it is already on disk."""
+        if self.latest is not None and self.latest[0] != self.saved:
+            self.write()
+
+    def write(self):
+        iteration, arrays, meta, random_state = self.latest
+        save_checkpoint(self.path, self.solver, iteration, self.n, arrays, meta, random_state)
+        self.saved = iteration
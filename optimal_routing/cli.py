@@ -0,0 +1,409 @@
+"""Command line entry point: python -m optimal_routing <command> [options].
+
+Solver modules are imported by the command that needs them, and matplotlib only with --plot.
+"""
+import argparse
+import importlib
+import random
+
+GA_VARIANTS = ('ga', 'ga1', 'ga2', 'exp')
+LOCAL_SEARCHES = ('2opt', 'oropt', 'or2opt')  # Keys of local_search.LOCAL_SEARCHES, listed here to keep startup light
+BENCHMARK_SUITES = ('full', 'quick')  # Keys of benchmark.SUITES, likewise
+BENCHMARK_SOLVERS = ('aco', 'aco-or2opt', 'ga', 'ga1', 'ga2', 'exp', 'de', 'de-or2opt')  # Keys of benchmark.SOLVERS
+
+
+def seed_everything(seed):
+    import numpy as np
+
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+
+def load(path, cache=None):
+    """The instance at path, its distance matrix as a plain array and its entry in cache (an InstanceCache, or None).
+
+    With a cache the matrix is read from the entry, memory-mapped, if an earlier run already computed it.
+    """
+    import numpy as np
+    from .instances import load_instance
+
+    instance = load_instance(path)
+    if cache is None:
+        return instance, np.asarray(instance.distance_matrix(), dtype=float), None
+    entry = cache.entry_for(instance)
+    return instance, entry.distances(), entry
+
+
+def instance_cache(args):
+    """The InstanceCache for --cache; None without it, or without --instance (random instances never come back)."""
+    if not args.cache or not args.instance:
+        return None
+    from .instance_cache import InstanceCache
+
+    return InstanceCache(args.cache, int(args.cache_size * 2**20))
+
+
+def solve_exactly(args, n, distances, instruments=None, labels=None):
+    """Print the optimal tour of an instance of at most exact.EXACT_MAX_CITIES cities, found by Held-Karp, and
+    return True; larger instances, and any with --no-exact, are left to the solver (False).
+
+    distances is the matrix, or a function returning it that is only called for an instance this small.
+    instruments time the solve in a 'held_karp' phase and are saved to --profile, as the solver's would be.
+    labels name the cities in the printed tour (default: their indices).
+    """
+    from .exact import EXACT_MAX_CITIES, held_karp
+    from .instrumentation import resolve
+
+    if args.no_exact or n > EXACT_MAX_CITIES:
+        return False
+    try:
+        with resolve(instruments).phase('held_karp'):
+            route, length = held_karp(distances() if callable(distances) else distances)
+    except ValueError as error:  # Every tour has an infinite leg
+        raise SystemExit(str(error))
+    save_profile(args, instruments)
+    print(f"{n} cities: solved exactly by Held-Karp (--no-exact runs {args.command} instead)")
+    print(f"Optimal route found: {route if labels is None else [labels[i] for i in route]}")
+    print(f"Total distance: {length:.2f}")
+    return True
+
+
+def budget_options(args):
+    """time_limit, target and callback keyword arguments for any solver, from the shared options."""
+    from .budget import print_progress
+
+    return dict(time_limit=args.time_limit, target=args.target, callback=None if args.quiet else print_progress)
+
+
+def checkpoint_options(args):
+    """checkpoint, checkpoint_interval, resume and warm_start keyword arguments, from the shared options."""
+    return dict(checkpoint=args.checkpoint, checkpoint_interval=args.checkpoint_interval, resume=args.resume,
+                warm_start=args.warm_start)
+
+
+def make_instruments(args):
+    """Instruments for --profile, tracing memory with --trace-memory; None without --profile."""
+    if not args.profile:
+        return None
+    from .instrumentation import Instruments
+
+    return Instruments(trace_memory=args.trace_memory)
+
+
+def save_profile(args, instruments):
+    if instruments is not None:
+        instruments.close()
+        instruments.save(args.profile, labels={'solver': args.command})
+        print(f"Profile written to {args.profile}")
+
+
+def run_aco(args):
+    from .aco.aco_gpt import AdaptiveACO
+    from .aco.multi_colony import MultiColonyACO
+
+    points = distances = None
+    n_points = args.points
+    cache = instance_cache(args)
+    instruments = make_instruments(args)
+    if args.instance:
+        if args.candidates is not None:
+            instance, _, _ = load(args.instance)
+            distances = None  # Candidate-list mode works from the coordinates alone, and caches its neighbour lists
+        else:
+            instance, distances, cache = load(args.instance, cache)  # Heuristic and neighbour lists join the entry
+        matrix = instance.distance_matrix if distances is None else distances  # Only computed if solved exactly
+        if not args.start and solve_exactly(args, instance.n, matrix, instruments):
+            return
+        points, n_points = instance.points, instance.n
+
+    options = dict(n_points=n_points, n_ants=args.ants, alpha=args.alpha, beta=args.beta,
+                   evaporation_rate=args.evaporation, n_candidates=args.candidates, points=points, distances=distances,
+                   local_search=args.local_search, improve_ants=args.improve_ants)
+    run_options = budget_options(args)
+    if args.colonies > 1:
+        if args.checkpoint or args.resume or args.warm_start:
+            raise SystemExit("Checkpoints are not supported with --colonies")
+        aco = MultiColonyACO(**options, n_colonies=args.colonies, seed=args.seed)
+    else:
+        aco = AdaptiveACO(**options, cache=cache)
+        run_options.update(checkpoint_options(args))
+    aco.run(visualize=args.plot, instruments=instruments, **run_options)
+    save_profile(args, instruments)
+    if args.start and len(args.start) == 1:
+        aco.find_closest_path(args.start[0], visualize=args.plot)
+    elif args.start:
+        paths, distances = aco.find_closest_paths(args.start)  # One batch, no plots
+        for start, path, distance in zip(args.start, paths, distances):
+            print(f"Point {start} joins the optimal path at {path[-1]} after {len(path) - 1} legs, distance {distance:.2f}")
+
+
+def demo_network(module):
+    """A GA variant's own demo network: fixed waypoints for ga and exp, random ones (drawn after --seed) for ga1
+    and ga2."""
+    return module.demo_network() if hasattr(module, 'demo_network') else module.random_network()
+
+
+def run_ga(args):
+    from .ga.distance_matrix import DistanceMatrix
+
+    module = importlib.import_module(f'.ga.{args.variant}', __package__)
+    if (args.islands or 1) > 1 and (args.checkpoint or args.resume or args.warm_start):
+        raise SystemExit("Checkpoints are not supported with --islands")
+    entry = None
+    instruments = make_instruments(args)  # Before the network, so a Held-Karp solve is profiled as well
+    if args.instance:
+        instance, matrix, entry = load(args.instance, instance_cache(args))
+        network = DistanceMatrix(range(instance.n), matrix)
+    else:
+        network = demo_network(module)  # Runs the same way as an instance, checkpoints included
+    if solve_exactly(args, network.n, network.matrix, instruments, network.labels):  # The 6 and 8 waypoint demos too
+        return
+
+    options = dict(budget_options(args), **checkpoint_options(args), instruments=instruments)
+    if entry is not None and args.variant in ('ga2', 'exp'):  # The variants with 2-opt take its neighbour lists too
+        options['local_search'] = entry.local_search('2opt')
+    for option, value in (('n_islands', args.islands), ('migration_interval', args.migration_interval),
+                          ('population_size', args.population), ('generations', args.generations)):
+        if value is not None:  # Otherwise the variant's own default
+            options[option] = value
+    best_route = module.genetic_algorithm(network, **options)
+    if isinstance(best_route, tuple):  # ga2 and exp also return the number of generations run
+        best_route = best_route[0]
+    save_profile(args, instruments)
+    print(f"Optimal route found: {network.decode(best_route)}")
+    print(f"Total distance: {network.route_length(best_route):.2f}")
+
+
+def run_de(args):
+    from .de import de_gpt
+
+    points = entry = None
+    instruments = make_instruments(args)
+    if args.instance:
+        instance, distances, entry = load(args.instance, instance_cache(args))
+        if solve_exactly(args, instance.n, distances, instruments):
+            return
+        points = instance.points
+    else:
+        distances = de_gpt.random_distances(args.ports)
+
+    best_solution, best_fitness = de_gpt.differential_evolution(distances, args.pop_size, args.generations,
+                                                                args.local_search, instruments=instruments,
+                                                                **budget_options(args), **checkpoint_options(args),
+                                                                cache=entry)
+    save_profile(args, instruments)
+    print(f"\nOptimal route found: {best_solution}")
+    print(f"Total distance: {best_fitness:.2f}")
+    if args.plot:
+        de_gpt.visualize_de(best_solution, points, None if args.plot is True else args.plot)
+
+
+def run_decompose(args):
+    import numpy as np
+    from .decomposition import decompose
+
+    if args.instance:
+        from .instances import load_instance
+
+        instance = load_instance(args.instance)
+        if instance.points is None:
+            raise SystemExit("Decomposition clusters coordinates; this instance only has a distance matrix")
+        points, edge_weight_type = instance.points, instance.edge_weight_type
+    else:
+        points, edge_weight_type = np.random.rand(args.points, 2), 'EUC'
+
+    options = {}
+    if args.cluster_time_limit is not None:
+        options['time_limit'] = args.cluster_time_limit
+    if args.local_search:
+        options['local_search'] = args.local_search
+    if args.solver == 'ga':
+        options['variant'] = args.variant
+    instruments = make_instruments(args)
+    result = decompose(points, args.solver, args.cluster_size, args.repair_window, args.repair_search,
+                       edge_weight_type, args.workers, args.seed, instruments, **options)
+    save_profile(args, instruments)
+    print(f"{len(points)} points in {result.n_clusters} clusters")
+    for stage, seconds in result.seconds.items():
+        print(f"  {stage:<10} {seconds:8.2f} s")
+    print(f"Stitched length: {result.stitched_length:.2f}")
+    print(f"Total distance after boundary repair: {result.length:.2f}")
+
+
+def run_batch(args):
+    import time
+    import numpy as np
+    from .batch import solve_batch
+
+    matrices = np.load(args.matrices, mmap_mode='r')
+    options = {key: value for key, value in (('population_size', args.population), ('generations', args.generations))
+               if value is not None}
+    started = time.perf_counter()
+    routes, lengths = solve_batch(matrices, args.method, **options)
+    elapsed = time.perf_counter() - started
+    print(f"{len(routes)} instances of {routes.shape[1]} cities in {elapsed:.2f} s ({len(routes) / elapsed:.0f}/s)")
+    print(f"Mean distance: {lengths.mean():.2f}")
+    if args.output:
+        np.savez(args.output, routes=routes, lengths=lengths)
+        print(f"Routes and lengths written to {args.output}")
+
+
+def run_animation(args):
+    from .aco import exp_aco
+
+    try:
+        exp_aco.main(args.ports, args.ships, args.iterations, args.output, args.threshold, args.fps)
+    except RuntimeError as error:  # No writer for the --output format
+        raise SystemExit(str(error))
+
+
+def run_benchmark(args):
+    from . import benchmark
+
+    benchmark.main(args)
+
+
+def run_service(args):
+    from . import service
+
+    service.main(args)
+
+
+def add_benchmark_arguments(parser):
+    """The benchmark's options; defaults left as None are benchmark.py's (see benchmark.main())."""
+    parser.add_argument('--suite', choices=BENCHMARK_SUITES, default='quick')
+    parser.add_argument('--solvers', nargs='+', choices=BENCHMARK_SOLVERS, help="default: all of them")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tsplib-dir', help="directory searched for TSPLIB files with a known optimum or few enough "
+                                             "cities to solve exactly (default: data/tsplib in the repository)")
+    parser.add_argument('--imports-only', action='store_true', help="only measure cold-start import times")
+    parser.add_argument('--batch', action='store_true',
+                        help="also measure batch-solver throughput on small instances against the per-instance loop")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="JSON file of an earlier run to check for regressions")
+    parser.add_argument('--tolerance', type=float, help="relative change that counts as a regression (default: 0.2)")
+
+
+def add_service_arguments(parser):
+    """The service's options; defaults left as None are service.py's (see service.main())."""
+    parser.add_argument('--host', help="default: 127.0.0.1")
+    parser.add_argument('--port', type=int, help="default: 8765; 0 picks a free port")
+    parser.add_argument('--workers', type=int, help="solver processes, i.e. solves at once (default: CPU count)")
+    parser.add_argument('--queue-size', type=int, help="waiting requests per worker (default: 16)")
+    parser.add_argument('--cache-size', type=int, help="prepared instances kept per worker (default: 8)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='optimal_routing', description="ACO, GA and DE route optimization")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    aco = commands.add_parser('aco', help="adaptive ant colony optimization")
+    aco.add_argument('--instance', help="TSPLIB, .npy or raw instance file (default: random points)")
+    aco.add_argument('--points', type=int, default=20, help="number of random points without --instance")
+    aco.add_argument('--ants', type=int, default=20)
+    aco.add_argument('--alpha', type=float, default=1)
+    aco.add_argument('--beta', type=float, default=5)
+    aco.add_argument('--evaporation', type=float, default=0.1)
+    aco.add_argument('--candidates', type=int, help="candidate-list size, for large instances")
+    aco.add_argument('--colonies', type=int, default=1, help="above 1, run colonies in parallel processes")
+    aco.add_argument('--start', type=int, nargs='+', help="also find the path from these points to the optimal tour")
+    aco.add_argument('--improve-ants', choices=('best', 'all'), default='best', help="ants given to --local-search")
+    aco.set_defaults(run=run_aco)
+
+    ga = commands.add_parser('ga', help="genetic algorithm variants")
+    ga.add_argument('--variant', choices=GA_VARIANTS, default='exp')
+    ga.add_argument('--instance', help="TSPLIB, .npy or raw instance file (default: the variant's demo waypoints)")
+    ga.add_argument('--population', type=int, help="routes per generation (default: the variant's own)")
+    ga.add_argument('--generations', type=int, help="most generations to run (default: the variant's own)")
+    ga.add_argument('--islands', type=int, help="above 1, evolve this many populations in parallel processes")
+    ga.add_argument('--migration-interval', type=int, metavar='N',
+                    help="generations between exchanges of the best routes across --islands")
+    ga.set_defaults(run=run_ga)
+
+    de = commands.add_parser('de', help="differential evolution")
+    de.add_argument('--instance', help="TSPLIB, .npy or raw instance file (default: random distances)")
+    de.add_argument('--ports', type=int, default=10, help="number of random ports without --instance")
+    de.add_argument('--pop-size', type=int, default=50)
+    de.add_argument('--generations', type=int, default=100)
+    de.set_defaults(run=run_de)
+
+    decompose = commands.add_parser('decompose', help="cluster-first, route-second solving of very large instances")
+    decompose.add_argument('--instance', help="TSPLIB, .npy or raw coordinate file (default: random points)")
+    decompose.add_argument('--points', type=int, default=10000, help="number of random points without --instance")
+    decompose.add_argument('--solver', choices=('aco', 'ga', 'de'), default='aco', help="solver for every cluster")
+    decompose.add_argument('--variant', choices=GA_VARIANTS, default='exp', help="GA variant with --solver ga")
+    decompose.add_argument('--local-search', choices=LOCAL_SEARCHES, help="local search inside the cluster solver")
+    decompose.add_argument('--cluster-size', type=int, default=200, help="largest number of points in a cluster")
+    decompose.add_argument('--cluster-time-limit', type=float, metavar='SECONDS', help="time limit of each cluster")
+    decompose.add_argument('--workers', type=int, help="processes solving clusters (default: one per CPU)")
+    decompose.add_argument('--repair-window', type=int, default=25,
+                           help="tour positions on each side of a cluster junction that the repair may rearrange")
+    decompose.add_argument('--repair-search', choices=LOCAL_SEARCHES, default='or2opt', help="boundary repair moves")
+    decompose.add_argument('--seed', type=int)
+    decompose.add_argument('--profile', metavar='PATH', help="write the stage timers here (as for aco, ga and de)")
+    decompose.add_argument('--trace-memory', action='store_true', help="with --profile, also sample peak memory")
+    decompose.set_defaults(run=run_decompose)
+
+    batch = commands.add_parser('batch', help="solve a stack of small instances together")
+    batch.add_argument('matrices', help=".npy file holding a (batch, n, n) array of distance matrices")
+    batch.add_argument('--method', choices=('auto', 'exhaustive', 'held_karp', 'genetic'), default='auto',
+                       help="auto: exact enumeration for the smallest instances, Held-Karp up to 12 cities, "
+                            "the batched GA beyond")
+    batch.add_argument('--population', type=int, help="GA routes per instance")
+    batch.add_argument('--generations', type=int)
+    batch.add_argument('--output', metavar='PATH', help="write routes and lengths to this .npz file")
+    batch.add_argument('--seed', type=int)
+    batch.set_defaults(run=run_batch)
+
+    animate = commands.add_parser('animate', help="animated ship-routing ACO demo")
+    animate.add_argument('--ports', type=int, default=10)
+    animate.add_argument('--ships', type=int, default=5)
+    animate.add_argument('--iterations', type=int, default=100)
+    animate.add_argument('--threshold', type=float, default=0.05,
+                         help="pheromone edges below this fraction of the strongest are not drawn")
+    animate.add_argument('--output', metavar='PATH',
+                         help="write .mp4 (needs ffmpeg) or .gif frames, or the last frame as .png, without a display")
+    animate.add_argument('--fps', type=float, default=5)
+    animate.add_argument('--seed', type=int)
+    animate.set_defaults(run=run_animation)
+
+    for command in (aco, de):
+        command.add_argument('--plot', nargs='?', const=True, default=False, metavar='PATH',
+                             help="show the result with matplotlib, or write it to PATH (.png, .svg, .pdf) headless")
+        command.add_argument('--local-search', choices=LOCAL_SEARCHES, help="improve tours with these moves")
+    for command in (aco, ga, de):
+        command.add_argument('--seed', type=int)
+        command.add_argument('--time-limit', type=float, help="stop after this many seconds with the best tour so far")
+        command.add_argument('--target', type=float, help="stop once the best tour is at most this long")
+        command.add_argument('--quiet', action='store_true', help="no per-iteration progress lines")
+        command.add_argument('--profile', metavar='PATH',
+                             help="write phase timers, counters and traces here (Prometheus text for .prom, else JSON)")
+        command.add_argument('--trace-memory', action='store_true', help="with --profile, also sample peak memory")
+        command.add_argument('--checkpoint', metavar='PATH', help="save the solver state to this .npz file as it runs")
+        command.add_argument('--checkpoint-interval', type=int, default=10, metavar='N',
+                             help="iterations between checkpoints (one is also saved at the end)")
+        command.add_argument('--resume', metavar='PATH', help="continue exactly where this checkpoint left off")
+        command.add_argument('--warm-start', metavar='PATH', help="start a new run from this checkpoint's search state")
+        command.add_argument('--cache', metavar='DIR',
+                             help="keep the --instance's distance matrix and neighbour lists here for later runs")
+        command.add_argument('--cache-size', type=float, default=2048, metavar='MB',
+                             help="least recently used instances are dropped from --cache beyond this size")
+        command.add_argument('--no-exact', action='store_true',
+                             help="run the solver even on an instance small enough to solve exactly (12 cities), "
+                                  "such as the GA demo networks")
+
+    benchmark = commands.add_parser('benchmark', help="benchmark every solver and compare against a baseline")
+    add_benchmark_arguments(benchmark)
+    benchmark.set_defaults(run=run_benchmark)
+
+    serve = commands.add_parser('serve', help="local HTTP/JSON service around the solvers")
+    add_service_arguments(serve)
+    serve.set_defaults(run=run_service)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    seed_everything(getattr(args, 'seed', None))
+    args.run(args)
@@ -0,0 +1 @@
+"""Differential evolution over random-key encoded tours."""
@@ -0,0 +1,160 @@
+import numpy as np
+
+from ..budget import Budget, print_progress
+from ..checkpoint import Checkpointer, load_checkpoint, restore_random, seed_population
+from ..instance_cache import cache_entry
+from ..instrumentation import resolve
+from ..local_search import LOCAL_SEARCHES
+from ..plotting import finish, label_points, new_figure
+
+# --- Parameters ---
+N_PORTS = 10
+POP_SIZE = 50
+N_GENERATIONS = 100
+F = 0.8  # Differential weight
+CR = 0.7  # Crossover rate
+
+# --- Generate Random Distances ---
+def random_distances(n_ports=N_PORTS):
+    distances = np.random.randint(10, 100, size=(n_ports, n_ports))
+    np.fill_diagonal(distances, 0)
+    return (distances + distances.T) / 2  # Make symmetric
+
+# --- Fitness Function ---
+def fitness(population, distances):
+    # Tour length of every row of a (n_solutions, n_ports) array, closing edge included
+    population = np.atleast_2d(population).astype(int)  # Ensure integer indices
+    return distances[population, np.roll(population, -1, axis=1)].sum(axis=1)
+
+# --- Initialize Population ---
+def initialize_population(pop_size=POP_SIZE, n_ports=N_PORTS):
+    # One row per individual, each row a permutation of the ports
+    return np.argsort(np.random.rand(pop_size, n_ports), axis=1)
+
+# --- Mutation ---
+def pick_donors(pop_size):
+    # Three distinct donor indices per target, redrawing only the rows that collide
+    donors = np.random.randint(0, pop_size, size=(pop_size, 3))
+    clash = (donors[:, 0] == donors[:, 1]) | (donors[:, 0] == donors[:, 2]) | (donors[:, 1] == donors[:, 2])
+    while clash.any():
+        donors[clash] = np.random.randint(0, pop_size, size=(clash.sum(), 3))
+        clash = (donors[:, 0] == donors[:, 1]) | (donors[:, 0] == donors[:, 2]) | (donors[:, 1] == donors[:, 2])
+    return donors
+
+def mutate(population):
+    # Mutation and binomial crossover for every target at once
+    a, b, c = (population[donors].astype(float) for donors in pick_donors(len(population)).T)
+    crossover = np.random.rand(*population.shape) < CR
+    mutants = np.where(crossover, a + F * (b - c), population)
+    
+    # Ensure valid permutations
+    return create_valid_permutation(mutants)
+
+def create_valid_permutation(mutants):
+    # Convert each row to ranks to create a valid permutation
+    return np.argsort(mutants, axis=1).astype(int)
+
+# --- Run Differential Evolution ---
+def differential_evolution(distances, pop_size=POP_SIZE, n_generations=N_GENERATIONS, local_search=None,
+                           time_limit=None, target=None, callback=print_progress, instruments=None, checkpoint=None,
+                           checkpoint_interval=10, resume=None, warm_start=None, cache=None):
+    # distances can be any square matrix, e.g. one loaded with instances.load_instance (possibly a memmap)
+    # local_search ('2opt', 'oropt' or 'or2opt', or a ready LocalSearch over distances) polishes every trial tour before selection
+    # Stops early once time_limit seconds pass or the best fitness reaches target; callback gets each generation's progress
+    # instruments (an instrumentation.Instruments) times the mutate, local_search, fitness and selection phases
+    # checkpoint: .npz path the state is saved to every checkpoint_interval generations and at the end;
+    # resume continues exactly from such a file, warm_start seeds the population from one (or from given routes)
+    # cache (an instance_cache.InstanceCache, or the CacheEntry of distances) keeps the local search's neighbour
+    # lists for matrices seen before
+    if pop_size < 3:  # Every mutant needs three distinct donors; pick_donors() would never find them
+        raise ValueError(f"pop_size must be at least 3, got {pop_size}")
+    budget = Budget(time_limit, target)
+    instruments = resolve(instruments)
+    improver = local_search
+    if isinstance(local_search, str):
+        improver = (LOCAL_SEARCHES[local_search](distances) if cache is None
+                    else cache_entry(cache, distances=distances).local_search(local_search))
+    best_solution = None
+    best_fitness = float('inf')
+    start = 0
+    if resume is not None:
+        state = load_checkpoint(resume, 'de', len(distances))
+        population, population_fitness = state.arrays['population'], state.arrays['population_fitness']
+        best_solution, best_fitness, start = state.arrays['best_solution'], state.meta['best_fitness'], state.iteration
+        restore_random(state)
+    else:
+        population = initialize_population(pop_size, len(distances))
+        if warm_start is not None:
+            seed_population(population, warm_start)
+        population_fitness = fitness(population, distances)  # Cached between generations, only trials are evaluated
+        instruments.count('evaluations', len(population))
+    checkpointer = Checkpointer(checkpoint, checkpoint_interval, 'de', len(distances), start)
+    
+    for generation in range(start, n_generations):
+        with instruments.phase('mutate'):
+            trials = mutate(population)
+        if improver is not None:
+            moves = improver.moves
+            with instruments.phase('local_search'):
+                trials = np.array([improver.improve(trial) for trial in trials.tolist()])
+            instruments.count('local_search_moves', improver.moves - moves)
+        with instruments.phase('fitness'):
+            trial_fitness = fitness(trials, distances)
+        instruments.count('evaluations', len(trials))
+        
+        # Greedy selection: a trial replaces its target if it is shorter
+        with instruments.phase('selection'):
+            improved = trial_fitness < population_fitness
+            population[improved] = trials[improved]
+            population_fitness[improved] = trial_fitness[improved]
+        
+        current = np.argmin(population_fitness)
+        if population_fitness[current] < best_fitness:
+            best_fitness = population_fitness[current]
+            best_solution = population[current].copy()
+            
+        instruments.trace(generation + 1, best_fitness)
+        checkpointer.step(generation + 1, {'population': population, 'population_fitness': population_fitness,
+                                           'best_solution': best_solution}, {'best_fitness': float(best_fitness)})
+        if budget.report(callback, generation + 1, best_fitness):
+            break
+    checkpointer.close()
+    
+    return best_solution, best_fitness
+
+# --- Visualization ---
+def visualize_de(best_solution, port_locations=None, output=None):
+    # Shown with pyplot, or written to output (.png, .svg, .pdf) without a display
+    figure = new_figure(output, figsize=(10, 6))
+    ax = figure.add_subplot()
+    
+    if port_locations is None:  # Without real coordinates the ports are placed at random
+        port_locations = np.random.rand(len(best_solution), 2)
+    ax.scatter(port_locations[:, 0], port_locations[:, 1], s=100, c='blue')
+    label_points(ax, port_locations, 'Port')  # Small instances only
+    
+    # Plot best path
+    best_solution = best_solution.astype(int)  # Ensure integer indices
+    x = port_locations[best_solution, 0]
+    y = port_locations[best_solution, 1]
+    ax.plot(np.append(x, x[0]), np.append(y, y[0]), 'r-', linewidth=2, label='Best Path')
+    
+    ax.set_title('Differential Evolution for TSP')
+    ax.legend()
+    finish(figure, output)
+
+def main():
+    np.random.seed(0)  # For reproducibility
+    distances = random_distances()
+
+    # --- Run the DE Algorithm ---
+    best_solution, best_fitness = differential_evolution(distances)
+    print(f"\nOptimal route found: {best_solution}")
+    print(f"Total distance: {best_fitness:.2f}")
+
+    # --- Visualize the Best Solution ---
+    visualize_de(best_solution)
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,212 @@
+"""Cluster-first, route-second decomposition for instances too large for the solvers' O(n^2) matrices.
+
+1. partition() splits the points into compact clusters of at most cluster_size points (k-d tree leaves).
+2. Each cluster's sub-tour is solved by ACO, a GA variant or DE, in parallel worker processes.
+3. order_clusters() tours the cluster centroids, and stitch() joins the sub-tours in that order, entering each
+   cluster at its point closest to the previous exit.
+4. repair() runs a local search over a window of the tour around every junction, the window's ends held in place.
+
+No stage ever builds more than a cluster-sized (or centroid-count-sized) matrix, so time and memory grow about
+linearly with n for a fixed cluster size.
+"""
+import contextlib
+import importlib
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .instances import pairwise_distances, point_distances
+from .instrumentation import resolve
+from .local_search import LOCAL_SEARCHES, TwoOpt
+
+CLUSTER_SIZE = 200  # Largest cluster handed to a solver
+REPAIR_WINDOW = 25  # Tour positions on each side of a junction that the boundary repair may rearrange
+
+Decomposition = namedtuple('Decomposition', ['tour', 'length', 'stitched_length', 'n_clusters', 'seconds'])
+
+
+def partition(points, cluster_size=CLUSTER_SIZE):
+    """Index arrays of spatially compact clusters of at most cluster_size points.
+
+    Blocks of points are halved at the median of their wider side until they are small enough (the leaves of
+    a k-d tree), so clusters hold between cluster_size / 2 and cluster_size points.
+    """
+    clusters = []
+    pending = [np.arange(len(points))]
+    while pending:
+        members = pending.pop()
+        if len(members) <= cluster_size:
+            clusters.append(members)
+            continue
+        coordinates = points[members, :2]
+        axis = np.argmax(np.ptp(coordinates, axis=0))
+        half = len(members) // 2
+        order = np.argpartition(coordinates[:, axis], half)
+        pending += [members[order[half:]], members[order[:half]]]
+    return clusters
+
+
+def solve_aco(points, matrix, n_ants=20, alpha=1, beta=5, evaporation_rate=0.1, time_limit=None, target=None,
+              **options):
+    from .aco.aco_gpt import AdaptiveACO
+
+    aco = AdaptiveACO(len(points), n_ants, alpha, beta, evaporation_rate, points=points, distances=matrix, **options)
+    return aco.run(time_limit=time_limit, target=target, callback=None)[0]
+
+
+def solve_ga(points, matrix, variant='exp', **options):
+    from .ga.distance_matrix import DistanceMatrix
+
+    module = importlib.import_module(f'.ga.{variant}', __package__)
+    route = module.genetic_algorithm(DistanceMatrix(range(len(matrix)), matrix), callback=None, **options)
+    return route[0] if isinstance(route, tuple) else route  # ga2 and exp also return the generations run
+
+
+def solve_de(points, matrix, **options):
+    from .de.de_gpt import differential_evolution
+
+    return differential_evolution(matrix, callback=None, **options)[0]
+
+
+SOLVE_FUNCTIONS = {
+    'aco': solve_aco,
+    'ga': solve_ga,
+    'de': solve_de,
+}
+
+
+def solve_cluster(points, solver, options, seed, edge_weight_type='EUC'):
+    """Worker side: the closed tour through one cluster's points, as positions into points."""
+    if len(points) < 4:  # Every order of three points is the same tour
+        return np.arange(len(points))
+    random.seed(seed)
+    np.random.seed(seed)
+    matrix = pairwise_distances(points, points, edge_weight_type)
+    np.fill_diagonal(matrix, 0)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):  # The solvers report as they go
+        route = SOLVE_FUNCTIONS[solver](points, matrix, **options)
+    return np.asarray(route, dtype=int)
+
+
+def order_clusters(centroids, edge_weight_type='EUC'):
+    """Visiting order of the clusters: a nearest-neighbour tour of their centroids, improved by 2-opt."""
+    k = len(centroids)
+    if k < 4:
+        return np.arange(k)
+    matrix = pairwise_distances(centroids, centroids, edge_weight_type)
+    np.fill_diagonal(matrix, 0)
+    visited = np.zeros(k, dtype=bool)
+    tour = [0]
+    visited[0] = True
+    for _ in range(k - 1):
+        row = np.where(visited, np.inf, matrix[tour[-1]])
+        tour.append(int(np.argmin(row)))
+        visited[tour[-1]] = True
+    return np.array(TwoOpt(matrix).improve(tour))
+
+
+def stitch(points, clusters, tours, order, centroids, edge_weight_type='EUC'):
+    """One global tour from the clusters' sub-tours, visited in order; also returns where each cluster starts.
+
+    Each sub-tour is cut open at its point closest to the previous cluster's exit, and walked in the direction
+    whose last point lies closer to the next cluster's centroid.
+    """
+    previous = centroids[order[-1]]  # The first cluster is entered from the side of the last one
+    pieces = []
+    for i, c in enumerate(order):
+        cycle = clusters[c][tours[c]]
+        entry = int(np.argmin(point_distances(points[cycle], previous, edge_weight_type)))
+        forward = np.roll(cycle, -entry)  # Ends at the entry's predecessor
+        backward = np.roll(forward[::-1], 1)  # Ends at the entry's successor
+        following = centroids[order[(i + 1) % len(order)]]
+        if point_distances(points[backward[-1]], following, edge_weight_type) < \
+                point_distances(points[forward[-1]], following, edge_weight_type):
+            forward = backward
+        pieces.append(forward)
+        previous = points[forward[-1]]
+    starts = np.cumsum([0] + [len(piece) for piece in pieces[:-1]])
+    return np.concatenate(pieces), starts
+
+
+def repair(tour, points, junctions, window=REPAIR_WINDOW, local_search='or2opt', edge_weight_type='EUC'):
+    """Improve the tour in place around each junction (a position where a cluster starts); returns the moves made.
+
+    Every window of 2 * window consecutive positions is searched as a closed tour whose closing edge, between
+    the window's first and last city, costs so much less than any other that no improving move removes it.
+    The rest of the tour therefore stays connected to the window's ends as before.
+    """
+    n = len(tour)
+    window = min(window, n // 2)
+    if window < 2:
+        return 0
+    moves = 0
+    for junction in junctions:
+        positions = np.arange(junction - window, junction + window) % n
+        cities = tour[positions]
+        matrix = pairwise_distances(points[cities], points[cities], edge_weight_type)
+        np.fill_diagonal(matrix, 0)
+        matrix[0, -1] = matrix[-1, 0] = -(matrix.max() * len(matrix) + 1)  # Pins the window's ends
+        improver = LOCAL_SEARCHES[local_search](matrix)
+        order = improver.improve(range(len(cities)))
+        if order[-1] != len(cities) - 1:  # The pinned edge came out as the first leg; walk the cycle the other way
+            order = [0] + order[:0:-1]
+        tour[positions] = cities[order]
+        moves += improver.moves
+    return moves
+
+
+def tour_length(points, tour, edge_weight_type='EUC'):
+    return float(point_distances(points[tour], points[np.roll(tour, -1)], edge_weight_type).sum())
+
+
+@contextlib.contextmanager
+def stage(name, seconds, instruments):
+    """Time one stage into seconds[name], and as a phase of instruments."""
+    start = time.perf_counter()
+    with instruments.phase(name):
+        yield
+    seconds[name] = time.perf_counter() - start
+
+
+def decompose(points, solver='aco', cluster_size=CLUSTER_SIZE, repair_window=REPAIR_WINDOW, repair_search='or2opt',
+              edge_weight_type='EUC', max_workers=None, seed=None, instruments=None, **options):
+    """Solve a large coordinate instance cluster by cluster; see the module docstring.
+
+    solver is 'aco', 'ga' or 'de', and options go to it for every cluster (e.g. time_limit, local_search, or
+    variant for 'ga'). max_workers processes solve the clusters (1 solves them in this process); repair_search
+    names the boundary repair's moves (None skips the repair). seconds in the result holds the time of every stage, so the
+    clustering, ordering, stitching and repair overhead can be told apart from the solving itself;
+    instruments (an instrumentation.Instruments) also gets each stage as a phase.
+    """
+    instruments = resolve(instruments)
+    points = np.asarray(points, dtype=float)
+    seconds = {}
+    with stage('clustering', seconds, instruments):
+        clusters = partition(points, cluster_size)
+
+    with stage('solving', seconds, instruments):
+        seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(clusters))]
+        jobs = [(points[members], solver, options, s, edge_weight_type) for members, s in zip(clusters, seeds)]
+        if max_workers == 1:
+            tours = [solve_cluster(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                tours = list(pool.map(solve_cluster, *zip(*jobs)))
+
+    with stage('ordering', seconds, instruments):
+        centroids = np.array([points[members, :2].mean(axis=0) for members in clusters])
+        order = order_clusters(centroids, edge_weight_type)
+
+    with stage('stitching', seconds, instruments):
+        tour, junctions = stitch(points, clusters, tours, order, centroids, edge_weight_type)
+    stitched_length = tour_length(points, tour, edge_weight_type)
+
+    with stage('repair', seconds, instruments):
+        if repair_search is not None and len(clusters) > 1:
+            instruments.count('local_search_moves', repair(tour, points, junctions, repair_window, repair_search,
+                                                           edge_weight_type))
+    return Decomposition(tour, tour_length(points, tour, edge_weight_type), stitched_length, len(clusters), seconds)
@@ -0,0 +1,47 @@
+"""Repairs for routes whose instance changed: waypoints removed or added since the routes were built.
+
+Routes are rows of an integer array (a GA population, a single ACO path as one row). After waypoints are
+removed, the remaining ones are renumbered like the rows of the shrunken distance matrix; added waypoints
+are numbered after the existing ones and go wherever they lengthen each route least.
+"""
+import numpy as np
+
+
+def drop_cities(routes, removed):
+    """Routes without the removed cities, the others renumbered to close the gaps."""
+    routes = np.atleast_2d(routes)
+    removed = np.sort(np.asarray(removed, dtype=routes.dtype).ravel())
+    kept = routes[~np.isin(routes, removed)].reshape(len(routes), -1)
+    return kept - np.searchsorted(removed, kept).astype(routes.dtype)  # Minus the number of removed cities below
+
+
+def insert_cities(routes, cities, matrix, closed=True):
+    """Insert each city into every route at its cheapest position (cheapest insertion, all routes at once).
+
+    With closed=False routes are open paths: a city may also go after the last one, and never before the first.
+    """
+    routes = np.atleast_2d(routes)
+    for city in np.asarray(cities).ravel():
+        following = np.roll(routes, -1, axis=1)
+        extra = matrix[routes, city] + matrix[city, following] - matrix[routes, following]  # Insert after position p
+        if not closed:
+            extra[:, -1] = matrix[routes[:, -1], city]  # Appending breaks no edge
+        after = np.argmin(extra, axis=1)[:, None]
+
+        positions = np.arange(routes.shape[1] + 1)
+        sources = np.minimum(positions - (positions > after), routes.shape[1] - 1)
+        grown = np.take_along_axis(routes, sources, axis=1)
+        grown[np.arange(len(routes)), after[:, 0] + 1] = city
+        routes = grown
+    return routes
+
+
+def repair_routes(routes, matrix, removed=(), added=(), closed=True):
+    """Routes made valid for the changed instance: removed cities dropped (indices into the old matrix) and
+    added ones (indices into the new matrix, the new matrix being matrix) inserted at their cheapest positions."""
+    routes = np.atleast_2d(np.asarray(routes))
+    if len(removed):
+        routes = drop_cities(routes, removed)
+    if len(added):
+        routes = insert_cities(routes, added, np.asarray(matrix), closed)
+    return routes
@@ -0,0 +1,95 @@
+"""Exact solutions of small instances by Held-Karp dynamic programming over bitmasks of visited cities.
+
+cost[S, j] is the length of the shortest path that leaves city 0, visits exactly the cities in S and ends at
+j in S. It is computed one subset size at a time, each layer from the previous one with numpy over all subsets
+and all instances of a batch at once. Only two layers of costs are kept, plus one int8 table of predecessors
+for rebuilding the tours, so an instance of n cities needs about 2^(n-1) * (n-1) bytes (10 MB at 20 cities).
+Legs may differ by direction: symmetric and asymmetric matrices are solved alike.
+"""
+import numpy as np
+
+HELD_KARP_MAX_CITIES = 20  # 2^(n-1) * (n-1) table cells per instance; beyond this it grows out of hand
+EXACT_MAX_CITIES = 12  # Below or at this size the solver entry points dispatch to held_karp automatically
+TABLE_CELLS = 2**24  # Predecessor-table cells held at once; batches are split to stay under it
+
+
+def subset_layers(m):
+    """Masks over m bits grouped by size: the masks sorted by bit count, where each size starts in that
+    order, and every mask's position within its own size."""
+    bit_counts = np.zeros(1 << m, dtype=np.int8)
+    for bit in range(m):
+        bit_counts[1 << bit:2 << bit] = bit_counts[:1 << bit] + 1
+    order = np.argsort(bit_counts, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(np.bincount(bit_counts, minlength=m + 1))))
+    position = np.empty(1 << m, dtype=np.intp)
+    position[order] = np.arange(1 << m) - starts[bit_counts[order]]
+    return order, starts, position
+
+
+def held_karp_batch(matrices):
+    """Optimal closed tours, a (batch, n) array starting at city 0, and their lengths for a (batch, n, n) stack.
+
+    Raises ValueError if an instance has no closed tour of finite length.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    batch, n = matrices.shape[:2]
+    if n > HELD_KARP_MAX_CITIES:
+        raise ValueError(f"Held-Karp is limited to {HELD_KARP_MAX_CITIES} cities, not {n}")
+    if n <= 2:  # A single tour
+        routes = np.broadcast_to(np.arange(n), (batch, n)).copy()
+        lengths = matrices[:, routes[0], np.roll(routes[0], -1)].sum(axis=1)
+    else:
+        routes = np.empty((batch, n), dtype=np.intp)
+        lengths = np.empty(batch)
+        chunk = max(1, TABLE_CELLS // ((1 << (n - 1)) * (n - 1)))
+        for lo in range(0, batch, chunk):
+            routes[lo:lo + chunk], lengths[lo:lo + chunk] = held_karp_chunk(matrices[lo:lo + chunk])
+
+    infeasible = np.flatnonzero(np.isinf(lengths))
+    if len(infeasible):  # Their routes were rebuilt from predecessors of infinite paths, and are no tours
+        raise ValueError(f"No closed tour of finite length in instance(s) {infeasible[:10].tolist()}")
+    return routes, lengths
+
+
+def held_karp_chunk(matrices):
+    batch, n = matrices.shape[:2]
+    m = n - 1  # Cities 1..n-1 are bits 0..m-1 of a mask; city 0 is where every path starts
+    order, starts, position = subset_layers(m)
+    legs = matrices[:, 1:, 1:]
+    instances = np.arange(batch)
+
+    # Single-city subsets: straight from city 0
+    cost = np.full((batch, m, m), np.inf)
+    cost[:, np.arange(m), np.arange(m)] = matrices[:, 0, 1:]
+    predecessor = np.zeros((batch, 1 << m, m), dtype=np.int8)
+
+    for size in range(2, m + 1):
+        masks = order[starts[size]:starts[size + 1]]
+        layer = np.full((batch, len(masks), m), np.inf)
+        for j in range(m):
+            rows = np.flatnonzero((masks >> j) & 1)
+            # Paths through the subset without j, ending anywhere (inf where that end is not in it), then on to j
+            candidates = cost[:, position[masks[rows] ^ (1 << j)], :] + legs[:, None, :, j]
+            best = np.argmin(candidates, axis=2)
+            layer[:, rows, j] = np.take_along_axis(candidates, best[..., None], axis=2)[..., 0]
+            predecessor[:, masks[rows], j] = best
+        cost = layer
+
+    closing = cost[:, 0, :] + matrices[:, 1:, 0]  # The only full subset, back to city 0
+    last = np.argmin(closing, axis=1)
+    lengths = closing[instances, last]
+
+    routes = np.zeros((batch, n), dtype=np.intp)
+    mask = np.full(batch, (1 << m) - 1)
+    for p in range(n - 1, 0, -1):
+        routes[:, p] = last + 1
+        previous = predecessor[instances, mask, last]
+        mask = mask ^ (1 << last)
+        last = previous.astype(np.intp)
+    return routes, lengths
+
+
+def held_karp(matrix):
+    """Optimal closed tour through a single instance, as a list from city 0, and its length."""
+    routes, lengths = held_karp_batch(np.asarray(matrix, dtype=float)[None])
+    return routes[0].tolist(), float(lengths[0])
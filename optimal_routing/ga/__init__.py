@@ -0,0 +1 @@
+"""Genetic algorithm variants (ga, ga1, ga2, exp) and their shared operators."""
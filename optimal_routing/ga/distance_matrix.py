@@ -0,0 +1,69 @@
+import numpy as np
+
+# Below this size the matrix is also kept as nested lists, which index much faster than numpy scalars
+LIST_LOOKUP_MAX_CITIES = 2048
+
+
+class DistanceMatrix:
+    """Waypoint labels mapped to 0..n-1 and a dense (possibly asymmetric) matrix of leg costs."""
+
+    def __init__(self, labels, matrix):
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.n = len(self.labels)
+        self.rows = self.matrix.tolist() if self.n <= LIST_LOOKUP_MAX_CITIES else self.matrix
+
+    @classmethod
+    def compile(cls, waypoints, distances, penalty=1000):
+        """Build the matrix from a {(from, to): cost} dict; missing legs cost penalty (may be np.inf)."""
+        index = {waypoint: i for i, waypoint in enumerate(waypoints)}
+        matrix = np.full((len(waypoints), len(waypoints)), float(penalty))
+        np.fill_diagonal(matrix, 0)
+        for (a, b), distance in distances.items():
+            matrix[index[a], index[b]] = distance
+        return cls(waypoints, matrix)
+
+    def encode(self, route):
+        """Waypoint labels -> integer indices."""
+        return [self.index[label] for label in route]
+
+    def decode(self, route):
+        """Integer indices -> waypoint labels."""
+        return [self.labels[i] for i in route]
+
+    def set_distance(self, a, b, cost, symmetric=False):
+        """Change the cost of the leg a -> b (labels), and of b -> a if symmetric, in place."""
+        i, j = self.index[a], self.index[b]
+        for row, column in ((i, j), (j, i)) if symmetric else ((i, j),):
+            self.matrix[row, column] = cost
+            if isinstance(self.rows, list):
+                self.rows[row][column] = float(cost)
+
+    def add_waypoint(self, label, costs_to, costs_from=None):
+        """Append a waypoint; costs_to[i] is the cost from it to waypoint i, costs_from the reverse (by default
+        the same). Returns its index; routes built before need dynamic.repair_routes(..., added=[index])."""
+        n = self.n
+        matrix = np.zeros((n + 1, n + 1))
+        matrix[:n, :n] = self.matrix
+        matrix[n, :n] = costs_to
+        matrix[:n, n] = costs_to if costs_from is None else costs_from
+        self.__init__(self.labels + [label], matrix)
+        return n
+
+    def remove_waypoint(self, label):
+        """Delete a waypoint; the later ones move down one index. Returns the index it had, which routes built
+        before need for dynamic.repair_routes(..., removed=[index])."""
+        i = self.index[label]
+        self.__init__(self.labels[:i] + self.labels[i + 1:], np.delete(np.delete(self.matrix, i, axis=0), i, axis=1))
+        return i
+
+    def route_length(self, route):
+        """Length of the closed tour through route, including the leg back to the start."""
+        rows = self.rows
+        return sum(rows[a][b] for a, b in zip(route, route[1:])) + rows[route[-1]][route[0]]
+
+    def route_lengths(self, routes):
+        """Lengths of a whole (n_routes, n) array of closed tours at once."""
+        routes = np.asarray(routes)
+        return self.matrix[routes, np.roll(routes, -1, axis=1)].sum(axis=1)
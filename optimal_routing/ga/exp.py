@@ -0,0 +1,191 @@
+from collections import deque
+import numpy as np
+from . import operators
+from .distance_matrix import DistanceMatrix
+from ..budget import Budget, print_progress
+from ..checkpoint import Checkpointer, load_checkpoint, restore_random, seed_population
+from ..instrumentation import resolve
+from ..local_search import TwoOpt
+from .operators import random_routes, swap_mutation
+from .selection import evaluate_routes, rank, select
+
+# Parameters
+POPULATION_SIZE = 100
+MAX_GENERATIONS = 1000
+MUTATION_RATE = 0.2
+IMPROVEMENT_THRESHOLD = 0.001
+MAX_GENERATIONS_WITHOUT_IMPROVEMENT = 50
+N_ISLANDS = 1  # Above 1, evolve this many populations in parallel processes
+MIGRATION_INTERVAL = 10  # Generations between exchanges of the best routes across islands
+
+# Generate waypoints and distances
+waypoints = ['A', 'B', 'C', 'D', 'E', 'F']
+distances = {
+    ('A', 'B'): 100, ('B', 'A'): 110,
+    ('A', 'C'): 80, ('C', 'A'): 85,
+    ('A', 'D'): 120, ('D', 'A'): 125,
+    ('A', 'E'): 200, ('E', 'A'): 210,
+    ('A', 'F'): 180, ('F', 'A'): 185,
+    ('B', 'C'): 90, ('C', 'B'): 95,
+    ('B', 'D'): 70, ('D', 'B'): 75,
+    ('B', 'E'): 140, ('E', 'B'): 145,
+    ('B', 'F'): 130, ('F', 'B'): 135,
+    ('C', 'D'): 110, ('D', 'C'): 115,
+    ('C', 'E'): 85, ('E', 'C'): 90,
+    ('C', 'F'): 150, ('F', 'C'): 155,
+    ('D', 'E'): 100, ('E', 'D'): 105,
+    ('D', 'F'): 60, ('F', 'D'): 65,
+    ('E', 'F'): 95, ('F', 'E'): 100
+}
+
+# Compile the labelled table; the GA itself only works on integer indices into the matrix
+def demo_network():
+    return DistanceMatrix.compile(waypoints, distances, penalty=1000)
+
+def calculate_total_distance(route, network):
+    return network.route_length(route)
+
+def fitness(route, network):
+    total_distance = calculate_total_distance(route, network) # missing legs already carry the 1000 penalty in the compiled matrix
+    return 1 / total_distance if total_distance > 0 else 0
+
+def initial_population(network, population_size=POPULATION_SIZE):
+    # One contiguous (population_size, n) int32 array, a route per row
+    return random_routes(population_size, network.n)
+
+def ordered_crossover(parents1, parents2):
+    # One child per row pair: a random segment of parents1, then parents2's other cities filled in from the left
+    return operators.ordered_crossover(parents1, parents2)
+
+def mutate(routes):
+    # Each chromosome (a row of the array) mutates with probability MUTATION_RATE: two of its genes swap places
+    swap_mutation(routes, np.flatnonzero(np.random.rand(len(routes)) < MUTATION_RATE))
+    return routes
+
+def checkpoint_state(population, scores, best_route, best_fitness, generations_without_improvement,
+                     recent_best_distances):
+    # Arrays and scalars that checkpoint the run between generations (see checkpoint.py)
+    arrays = {'population': population, 'scores': scores, 'best_route': best_route,
+              'recent_best_distances': np.array(recent_best_distances, dtype=float)}
+    return arrays, {'best_fitness': float(best_fitness), 'generations_without_improvement': generations_without_improvement}
+
+def genetic_algorithm(network, population_size=POPULATION_SIZE, generations=MAX_GENERATIONS, time_limit=None, target=None,
+                      callback=print_progress, local_search=None, instruments=None, checkpoint=None, checkpoint_interval=10,
+                      resume=None, warm_start=None, n_islands=N_ISLANDS, migration_interval=MIGRATION_INTERVAL):
+    # Also stops once time_limit seconds pass or the best distance reaches target; callback gets each generation's progress
+    # instruments (an instrumentation.Instruments) times the selection, crossover, mutation, 2-opt and fitness phases
+    # checkpoint: .npz path the state is saved to every checkpoint_interval generations and at the end;
+    # resume continues exactly from such a file, warm_start seeds the population from one (or from given routes)
+    # n_islands above 1 evolves that many populations in parallel processes (island.py), exchanging their best
+    # routes every migration_interval generations; each island runs its own 2-opt, or its own copy of local_search
+    if n_islands > 1:
+        from .island import print_island_statistics, require_single_population, run_islands  # Only for island runs
+
+        require_single_population(checkpoint, resume, warm_start)
+        best_route, _, generation, islands = run_islands(
+            network.matrix, ordered_crossover, mutate, n_islands=n_islands, population_size=population_size,
+            generations=generations, migration_interval=migration_interval,
+            use_local_search=True if local_search is None else local_search,
+            patience=MAX_GENERATIONS_WITHOUT_IMPROVEMENT, time_limit=time_limit, target=target, callback=callback,
+            instruments=instruments)
+        if callback is not None:
+            print_island_statistics(islands)
+        return best_route, generation
+    budget = Budget(time_limit, target)
+    instruments = resolve(instruments)
+    # 2-opt local search with delta evaluation, neighbour lists and don't-look bits (see local_search.py),
+    # unless a ready LocalSearch over network.matrix is passed in
+    improver = TwoOpt(network.matrix) if local_search is None else local_search
+    two_opt = improver.improve
+    best_fitness = 0
+    best_route = None
+    generations_without_improvement = 0
+    generation = 0
+    
+    recent_best_distances = deque(maxlen=5) # double queue can pop elements from both ends,will store only the new elements
+    if resume is not None:
+        state = load_checkpoint(resume, 'exp', network.n)
+        population, scores, generation = state.arrays['population'], state.arrays['scores'], state.iteration
+        best_route = state.arrays['best_route'].tolist() if 'best_route' in state.arrays else None
+        best_fitness = state.meta['best_fitness']
+        generations_without_improvement = state.meta['generations_without_improvement']
+        recent_best_distances.extend(state.arrays['recent_best_distances'].tolist())
+        restore_random(state)
+    else:
+        population = initial_population(network, population_size)
+        if warm_start is not None:
+            seed_population(population, warm_start)
+        scores = evaluate_routes(population, network)  # Fitness is computed once per generation and reused below
+        instruments.count('evaluations', len(population))
+    # Checkpoints are taken at the start of a generation, the point a resumed run picks up from
+    checkpointer = Checkpointer(checkpoint, checkpoint_interval, 'exp', network.n, generation)
+    checkpointer.step(generation, *checkpoint_state(population, scores, best_route, best_fitness,
+                                                    generations_without_improvement, recent_best_distances))
+    
+    while generation < generations:
+        with instruments.phase('selection'):
+            population, scores = rank(population, scores) #stores all of the chromosomes in the population based on fitness level and in desc order so the best routes are placed first
+        current_best_route = population[0].tolist() 
+        current_best_fitness = scores[0]
+        current_best_distance = calculate_total_distance(current_best_route, network)
+        
+        if current_best_fitness > best_fitness: # checks if fitness level has increased or is gen fitness same
+            best_fitness = current_best_fitness
+            best_route = current_best_route
+            generations_without_improvement = 0
+            recent_best_distances.append(current_best_distance)
+        else:
+            generations_without_improvement += 1
+        
+        if len(recent_best_distances) == recent_best_distances.maxlen: #checks if the recent_best_distance is greater than the already stored best distance
+            improvement = (recent_best_distances[0] - current_best_distance) / recent_best_distances[0] # if true then it calcs the improvement value
+            if improvement < IMPROVEMENT_THRESHOLD:# it then checks if the improvement has increased or not
+                generations_without_improvement += 1
+            else:
+                generations_without_improvement = 0
+        
+        if generations_without_improvement >= MAX_GENERATIONS_WITHOUT_IMPROVEMENT: # this checks if the number of generations has crossed the set number without any improvement in the fitness level
+            if callback is not None:  # Progress output, off with the per-generation lines
+                print(f"Terminating: No significant improvement for {MAX_GENERATIONS_WITHOUT_IMPROVEMENT} generations.")
+            break
+        best_distance = calculate_total_distance(best_route, network)
+        instruments.trace(generation, best_distance)
+        if budget.report(callback, generation, best_distance):
+            break
+        
+        elites = population[:1]  # Elitism: it makes sure that the best route of the current gen is always preserved to the next gen also
+        
+        with instruments.phase('selection'):
+            parents = select(scores, 2 * (population_size - len(elites)), 'tournament').reshape(-1, 2)
+        with instruments.phase('crossover'):
+            children = ordered_crossover(population[parents[:, 0]], population[parents[:, 1]]) # it performs the GA operations like crossover and mutation on every pair at once, then the 2opt algo on each child
+        with instruments.phase('mutation'):
+            children = mutate(children)
+        moves = improver.moves
+        with instruments.phase('local_search'):
+            for k, child in enumerate(children.tolist()):
+                children[k] = two_opt(child)  # Apply local search
+        instruments.count('local_search_moves', improver.moves - moves)
+        
+        population = np.concatenate((elites, children))
+        with instruments.phase('fitness'):
+            scores = evaluate_routes(population, network)
+        instruments.count('evaluations', len(population))
+        generation += 1
+        checkpointer.step(generation, *checkpoint_state(population, scores, best_route, best_fitness,
+                                                        generations_without_improvement, recent_best_distances))
+    checkpointer.close()
+    
+    return best_route, generation
+
+def main(**options):
+    network = demo_network()
+
+    # Run the optimized algorithm; options go to genetic_algorithm(), e.g. n_islands
+    best_route, total_generations = genetic_algorithm(network, **options)
+    print(f"Optimal route found: {network.decode(best_route)}")
+    print(f"Total distance: {calculate_total_distance(best_route, network):.2f}")
+    print(f"Total generations: {total_generations}")
+
+if __name__ == "__main__":
+    main()
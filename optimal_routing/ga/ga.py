@@ -0,0 +1,154 @@
+import numpy as np
+import datetime
+from . import operators
+from .distance_matrix import DistanceMatrix
+from ..budget import Budget, print_progress
+from ..checkpoint import Checkpointer, load_checkpoint, restore_random, seed_population
+from ..instrumentation import resolve
+from .operators import insert_mutation, random_routes, reverse_mutation, swap_mutation
+from .selection import evaluate_routes, rank, select
+# Parameters
+POPULATION_SIZE = 200  # Increased population size
+NUM_GENERATIONS = 10
+MUTATION_RATE = 0.5 # Further increased mutation rate
+
+# Define waypoints and costs (with bidirectional pairs)
+waypoints = ['A', 'B', 'C', 'D', 'E', 'F']
+distances = {
+    ('A', 'B'): 100, ('B', 'A'): 110,
+    ('A', 'C'): 80, ('C', 'A'): 85,
+    ('A', 'D'): 120, ('D', 'A'): 125,
+    ('A', 'E'): 200, ('E', 'A'): 210,
+    ('A', 'F'): 180, ('F', 'A'): 185,
+    ('B', 'C'): 90, ('C', 'B'): 95,
+    ('B', 'D'): 70, ('D', 'B'): 75,
+    ('B', 'E'): 140, ('E', 'B'): 145,
+    ('B', 'F'): 130, ('F', 'B'): 135,
+    ('C', 'D'): 110, ('D', 'C'): 115,
+    ('C', 'E'): 85, ('E', 'C'): 90,
+    ('C', 'F'): 150, ('F', 'C'): 155,
+    ('D', 'E'): 100, ('E', 'D'): 105,
+    ('D', 'F'): 60, ('F', 'D'): 65,
+    ('E', 'F'): 95, ('F', 'E'): 100
+}
+
+# Compile the labelled table; the GA itself only works on integer indices into the matrix
+def demo_network():
+    return DistanceMatrix.compile(waypoints, distances, penalty=1000)
+
+
+# Fitness function (inverse of distance)
+def fitness(route, network):
+    # Closed tour length; missing legs already carry the penalty in the compiled matrix
+    total_distance = network.route_length(route)
+    return 1 / total_distance if total_distance > 0 else 0
+
+
+# Generate initial population: one contiguous (population_size, n) int32 array, a route per row
+def initial_population(network, population_size=POPULATION_SIZE):
+    return random_routes(population_size, network.n)
+
+
+# Ordered crossover of every parent pair at once
+def ordered_crossover(parents1, parents2):
+    # parents1's segment stays in place; parents2's other cities fill the rest, starting just after the segment
+    return operators.ordered_crossover(parents1, parents2, wrap=True)
+
+
+# Mutation with shuffling subsections
+def enhanced_mutate(routes):
+    # Each route mutates with probability MUTATION_RATE, by a swap, an insertion or a reversal picked at random
+    mutating = np.flatnonzero(np.random.rand(len(routes)) < MUTATION_RATE)
+    mutation_types = np.random.randint(0, 3, len(mutating))
+    swap_mutation(routes, mutating[mutation_types == 0])  # Swap two random cities
+    insert_mutation(routes, mutating[mutation_types == 1])  # Remove a city and insert it at a random position
+    reverse_mutation(routes, mutating[mutation_types == 2])  # Reverse a random subsection of the route
+    return routes
+
+# Main GA loop with elitism
+# Parameters
+POPULATION_SIZE = 300  # Increased population size
+NUM_GENERATIONS = 10  # Increased number of generations
+MUTATION_RATE = 0.2  # Decreased mutation rate
+N_ISLANDS = 1  # Above 1, evolve this many populations in parallel processes
+MIGRATION_INTERVAL = 5  # Generations between exchanges of the best routes across islands
+
+def genetic_algorithm(network, population_size=POPULATION_SIZE, generations=NUM_GENERATIONS, time_limit=None, target=None,
+                      callback=print_progress, instruments=None, checkpoint=None, checkpoint_interval=10, resume=None,
+                      warm_start=None, n_islands=N_ISLANDS, migration_interval=MIGRATION_INTERVAL):
+    # Also stops once time_limit seconds pass or the best distance reaches target; callback gets each generation's progress
+    # instruments (an instrumentation.Instruments) times the selection, crossover, mutation and fitness phases
+    # checkpoint: .npz path the state is saved to every checkpoint_interval generations and at the end;
+    # resume continues exactly from such a file, warm_start seeds the population from one (or from given routes)
+    # n_islands above 1 evolves that many populations in parallel processes (island.py), exchanging their best
+    # routes every migration_interval generations
+    if n_islands > 1:
+        from .island import print_island_statistics, require_single_population, run_islands  # Only for island runs
+
+        require_single_population(checkpoint, resume, warm_start)
+        best_route, _, _, islands = run_islands(
+            network.matrix, ordered_crossover, enhanced_mutate, n_islands=n_islands, population_size=population_size,
+            generations=generations, migration_interval=migration_interval, selection='roulette',
+            elitism=population_size // 10, time_limit=time_limit, target=target, callback=callback,
+            instruments=instruments)
+        if callback is not None:
+            print_island_statistics(islands)
+        return best_route
+    budget = Budget(time_limit, target)
+    instruments = resolve(instruments)
+    start = 0
+    if resume is not None:
+        state = load_checkpoint(resume, 'ga', network.n)
+        population, scores, start = state.arrays['population'], state.arrays['scores'], state.iteration
+        restore_random(state)
+    else:
+        population = initial_population(network, population_size)
+        if warm_start is not None:
+            seed_population(population, warm_start)
+        scores = evaluate_routes(population, network)  # Fitness is computed once per generation and reused below
+        instruments.count('evaluations', len(population))
+    checkpointer = Checkpointer(checkpoint, checkpoint_interval, 'ga', network.n, start)
+
+    for generation in range(start, generations):
+        with instruments.phase('selection'):
+            # Elitism: preserve the best 10% of individuals
+            elitism_count = population_size // 10
+            sorted_population, _ = rank(population, scores)
+            elites = sorted_population[:elitism_count]
+
+            # Roulette wheel selection of every parent pair at once, then crossover and mutation as one batch
+            parents = select(scores, 2 * (population_size - elitism_count), 'roulette').reshape(-1, 2)
+        with instruments.phase('crossover'):
+            children = ordered_crossover(population[parents[:, 0]], population[parents[:, 1]])
+        with instruments.phase('mutation'):
+            children = enhanced_mutate(children)
+
+        population = np.concatenate((elites, children))
+        with instruments.phase('fitness'):
+            scores = evaluate_routes(population, network)
+        instruments.count('evaluations', len(population))
+
+        best = np.argmax(scores)
+        best_distance = network.route_length(population[best].tolist())
+        instruments.trace(generation, best_distance)
+        checkpointer.step(generation + 1, {'population': population, 'scores': scores})
+        if budget.report(callback, generation, best_distance):
+            break
+    checkpointer.close()
+
+    return population[np.argmax(scores)].tolist()
+
+def main(**options):
+    network = demo_network()
+
+    # Run the genetic algorithm; options go to genetic_algorithm(), e.g. n_islands
+    t1=datetime.datetime.now()
+    best_route = genetic_algorithm(network, **options)
+    print(f"Optimal route found: {network.decode(best_route)}")
+    print(f"Total distance: {1/fitness(best_route, network)}")
+    t2=datetime.datetime.now()
+    print(f"Time Spent : {t2-t1}")
+
+if __name__ == "__main__":
+    main()
+
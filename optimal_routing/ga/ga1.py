@@ -0,0 +1,136 @@
+import random
+import numpy as np
+from . import operators
+from .distance_matrix import DistanceMatrix
+from ..budget import Budget, print_progress
+from ..checkpoint import Checkpointer, load_checkpoint, restore_random, seed_population
+from ..instrumentation import resolve
+from .operators import random_routes, swap_mutation
+from .selection import evaluate_routes, rank, select
+
+# Parameters
+POPULATION_SIZE = 10
+NUM_GENERATIONS = 10
+MUTATION_RATE = 0.2
+N_ISLANDS = 1  # Above 1, evolve this many populations in parallel processes
+MIGRATION_INTERVAL = 5  # Generations between exchanges of the best routes across islands
+
+# Generate waypoints and distances
+waypoints = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+
+def random_network(waypoints=waypoints):
+    distances = {}
+    for i in range(len(waypoints)):
+        for j in range(i+1, len(waypoints)):
+            distance = random.randint(50, 200)
+            distances[(waypoints[i], waypoints[j])] = distance
+            distances[(waypoints[j], waypoints[i])] = distance + random.randint(-20, 20)
+
+    # Ensure all waypoints are connected
+    for i in range(len(waypoints)):
+        next_point = waypoints[(i+1) % len(waypoints)]
+        distances[(waypoints[i], next_point)] = random.randint(30, 100)
+        distances[(next_point, waypoints[i])] = distances[(waypoints[i], next_point)] + random.randint(-10, 10)
+
+    # Compile the labelled table; the GA itself only works on integer indices into the matrix
+    return DistanceMatrix.compile(waypoints, distances, penalty=1000)
+
+def calculate_total_distance(route, network):
+    return network.route_length(route)
+
+def fitness(route, network):
+    return 1 / calculate_total_distance(route, network)
+
+def initial_population(network, population_size=POPULATION_SIZE):
+    # One contiguous (population_size, n) int32 array, a route per row
+    return random_routes(population_size, network.n)
+
+def ordered_crossover(parents1, parents2):
+    # One child per row pair: a random segment of parents1, then parents2's other cities filled in from the left
+    return operators.ordered_crossover(parents1, parents2)
+
+def mutate(routes):
+    # Swap two random cities in each route with probability MUTATION_RATE, in place
+    swap_mutation(routes, np.flatnonzero(np.random.rand(len(routes)) < MUTATION_RATE))
+    return routes
+
+def genetic_algorithm(network, population_size=POPULATION_SIZE, generations=NUM_GENERATIONS, time_limit=None, target=None,
+                      callback=print_progress, instruments=None, checkpoint=None, checkpoint_interval=10, resume=None,
+                      warm_start=None, n_islands=N_ISLANDS, migration_interval=MIGRATION_INTERVAL):
+    # Also stops once time_limit seconds pass or the best distance reaches target; callback gets each generation's progress
+    # instruments (an instrumentation.Instruments) times the selection, crossover, mutation and fitness phases
+    # checkpoint: .npz path the state is saved to every checkpoint_interval generations and at the end;
+    # resume continues exactly from such a file, warm_start seeds the population from one (or from given routes)
+    # n_islands above 1 evolves that many populations in parallel processes (island.py), exchanging their best
+    # routes every migration_interval generations
+    if n_islands > 1:
+        from .island import print_island_statistics, require_single_population, run_islands  # Only for island runs
+
+        require_single_population(checkpoint, resume, warm_start)
+        best_route, _, _, islands = run_islands(
+            network.matrix, ordered_crossover, mutate, n_islands=n_islands, population_size=population_size,
+            generations=generations, migration_interval=migration_interval, selection='tournament', elitism=2,
+            time_limit=time_limit, target=target, callback=callback, instruments=instruments)
+        if callback is not None:
+            print_island_statistics(islands)
+        return best_route
+    budget = Budget(time_limit, target)
+    instruments = resolve(instruments)
+    best_fitness = 0
+    start = 0
+    if resume is not None:
+        state = load_checkpoint(resume, 'ga1', network.n)
+        population, scores, start = state.arrays['population'], state.arrays['scores'], state.iteration
+        best_fitness = state.meta['best_fitness']
+        restore_random(state)
+    else:
+        population = initial_population(network, population_size)
+        if warm_start is not None:
+            seed_population(population, warm_start)
+        scores = evaluate_routes(population, network)  # Fitness is computed once per generation and reused below
+        instruments.count('evaluations', len(population))
+    checkpointer = Checkpointer(checkpoint, checkpoint_interval, 'ga1', network.n, start)
+    
+    for generation in range(start, generations):
+        with instruments.phase('selection'):
+            population, scores = rank(population, scores)
+        
+        if scores[0] > best_fitness:
+            best_fitness = scores[0]
+        
+        elites = population[:2]  # Elitism
+        
+        # Tournament selection of every parent pair at once, then crossover and mutation of all pairs in one batch
+        with instruments.phase('selection'):
+            parents = select(scores, 2 * (population_size - len(elites)), 'tournament').reshape(-1, 2)
+        with instruments.phase('crossover'):
+            children = ordered_crossover(population[parents[:, 0]], population[parents[:, 1]])
+        with instruments.phase('mutation'):
+            children = mutate(children)
+        
+        population = np.concatenate((elites, children))
+        with instruments.phase('fitness'):
+            scores = evaluate_routes(population, network)
+        instruments.count('evaluations', len(population))
+        
+        best_route = population[0].tolist()
+        best_distance = calculate_total_distance(best_route, network)
+        instruments.trace(generation, best_distance)
+        checkpointer.step(generation + 1, {'population': population, 'scores': scores}, {'best_fitness': float(best_fitness)})
+        if budget.report(callback, generation, best_distance):
+            break
+    checkpointer.close()
+    
+    return population[0].tolist()
+
+def main(**options):
+    network = random_network()
+
+    # Run the algorithm; options go to genetic_algorithm(), e.g. n_islands
+    best_route = genetic_algorithm(network, **options)
+    print(f"Optimal route found: {network.decode(best_route)}")
+    print(f"Total distance: {calculate_total_distance(best_route, network):.2f}")
+
+if __name__ == "__main__":
+    main()
+
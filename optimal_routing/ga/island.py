@@ -0,0 +1,174 @@
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .distance_matrix import DistanceMatrix
+from ..budget import Budget
+from ..instrumentation import resolve
+from ..local_search import LocalSearch, TwoOpt
+from .selection import evaluate_routes, rank, select
+
+# Set in every worker by attach_matrix(); the matrix itself lives in shared memory
+network = None
+local_search = None
+_shared = None
+
+
+def attach_matrix(name, shape, dtype, search=(TwoOpt, {})):
+    """Pool initializer: map the coordinator's distance matrix instead of receiving a pickled copy.
+
+    search is the (LocalSearch type, constructor keyword arguments) pair the worker builds its local search from.
+    """
+    global network, local_search, _shared
+    _shared = shared_memory.SharedMemory(name=name)
+    matrix = np.ndarray(shape, dtype=dtype, buffer=_shared.buf)
+    network = DistanceMatrix(range(shape[0]), matrix)
+    search_type, options = search
+    local_search = search_type(matrix, **options)
+
+
+def evolve(population, generations, seed, crossover, mutation, selection, elitism, use_local_search):
+    """Run one island for a number of generations on its own random stream; returns population and scores.
+
+    The population is a (population_size, n) int32 array; crossover and mutation are applied to all parent pairs at once.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    scores = evaluate_routes(population, network)
+
+    for _ in range(generations):
+        population, scores = rank(population, scores)
+
+        parents = select(scores, 2 * (len(population) - elitism), selection).reshape(-1, 2)
+        children = mutation(crossover(population[parents[:, 0]], population[parents[:, 1]]))
+        if use_local_search:
+            for k, child in enumerate(children.tolist()):
+                children[k] = local_search.improve(child)
+
+        population = np.concatenate((population[:elitism], children))
+        scores = evaluate_routes(population, network)
+
+    return population, scores
+
+
+def tour_lengths(matrix, routes):
+    """Closed-tour length of every row of a (pop, n) route array."""
+    return matrix[routes, np.roll(routes, -1, axis=1)].sum(axis=1)
+
+
+def migration_sources(n_islands, topology, rng):
+    """Index of the island that each island receives its migrants from."""
+    if topology == 'ring':
+        return [(i - 1) % n_islands for i in range(n_islands)]
+    if topology == 'random':
+        return [(i + rng.integers(1, n_islands)) % n_islands for i in range(n_islands)]
+    raise ValueError(f"Unknown migration topology: {topology}")
+
+
+def run_islands(matrix, crossover, mutation, n_islands=4, population_size=100, generations=100,
+                migration_interval=10, n_migrants=1, topology='ring', selection='tournament', elitism=1,
+                use_local_search=False, patience=None, seed=None, max_workers=None, time_limit=None, target=None,
+                callback=None, instruments=None):
+    """Evolve n_islands populations in a process pool, exchanging their best routes every migration_interval generations.
+
+    crossover and mutation must be module-level functions so they can be sent to the workers; both take and
+    return (pairs, n) route arrays, like the ones in the GA variants.
+    use_local_search=True improves every child with 2-opt; a LocalSearch over matrix is rebuilt in every worker
+    instead, from its type, settings() and neighbour lists.
+    Stops early once the global best has not improved for patience generations, once time_limit seconds
+    have passed or once the best distance reaches target; all three are checked at each migration.
+    callback receives a budget.Progress, counted in generations, after every migration interval; instruments
+    (an instrumentation.Instruments) times the 'islands' rounds and the 'migration' steps and traces every interval.
+    Returns the global best route, its distance, the number of generations run and a list of per-island statistics.
+    """
+    budget = Budget(time_limit, target)
+    instruments = resolve(instruments)
+    matrix = np.ascontiguousarray(matrix, dtype=float)
+    n = len(matrix)
+    n_migrants = min(n_migrants, population_size - elitism)
+    search = (TwoOpt, {})
+    if isinstance(use_local_search, LocalSearch):
+        search = (type(use_local_search), dict(use_local_search.settings(), neighbours=use_local_search.neighbours))
+
+    # One independent random stream per island, plus one for the coordinator's migration choices
+    *streams, coordinator_stream = np.random.SeedSequence(seed).spawn(n_islands + 1)
+    coordinator_rng = np.random.default_rng(coordinator_stream)
+    populations = []
+    for stream in streams:
+        rng = np.random.default_rng(stream.spawn(1)[0])
+        populations.append(np.array([rng.permutation(n) for _ in range(population_size)], dtype=np.int32))
+    scores = [None] * n_islands
+    lengths = [None] * n_islands
+    histories = [[] for _ in range(n_islands)]
+
+    best_route = None
+    best_distance = float('inf')
+    generation = 0
+    generations_without_improvement = 0
+
+    # The workers attach to this block by name, so the matrix is never pickled
+    shared = shared_memory.SharedMemory(create=True, size=matrix.nbytes)
+    np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shared.buf)[:] = matrix
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers or n_islands, initializer=attach_matrix,
+                                 initargs=(shared.name, matrix.shape, matrix.dtype, search)) as pool:
+            while generation < generations:
+                epoch = min(migration_interval, generations - generation)
+                with instruments.phase('islands'):
+                    futures = [
+                        pool.submit(evolve, populations[i], epoch, int(streams[i].spawn(1)[0].generate_state(1)[0]),
+                                    crossover, mutation, selection, elitism, bool(use_local_search))
+                        for i in range(n_islands)
+                    ]
+                    populations, scores = map(list, zip(*(future.result() for future in futures)))
+                generation += epoch
+                instruments.count('evaluations', n_islands * population_size * (epoch + 1))  # evolve() scores its input too
+
+                improved = False
+                for i in range(n_islands):
+                    lengths[i] = tour_lengths(matrix, populations[i])  # Not 1 / score, which is 0 for a zero-length tour
+                    island_best = int(np.argmin(lengths[i]))
+                    histories[i].append(float(lengths[i][island_best]))
+                    if histories[i][-1] < best_distance:
+                        best_distance = histories[i][-1]
+                        best_route = populations[i][island_best].tolist()
+                        improved = True
+                generations_without_improvement = 0 if improved else generations_without_improvement + epoch
+                instruments.trace(generation, best_distance)
+                if patience is not None and generations_without_improvement >= patience:
+                    break
+                if budget.report(callback, generation, best_distance):
+                    break
+
+                if n_islands > 1:
+                    # Migration: the best routes of the source island replace the worst routes of each island
+                    with instruments.phase('migration'):
+                        sources = migration_sources(n_islands, topology, coordinator_rng)
+                        migrants = [populations[s][np.argsort(-scores[s])[:n_migrants]] for s in sources]
+                        for i, incoming in enumerate(migrants):
+                            populations[i][np.argsort(scores[i])[:n_migrants]] = incoming
+    finally:
+        shared.close()
+        shared.unlink()
+
+    islands = [
+        {
+            'best_distance': min(history),
+            'mean_distance': float(np.mean(island_lengths)),
+            'history': history,
+        }
+        for history, island_lengths in zip(histories, lengths)
+    ]
+    return best_route, best_distance, generation, islands
+
+
+def require_single_population(checkpoint=None, resume=None, warm_start=None):
+    """Island runs are not checkpointed; a genetic_algorithm() call asking for both is an error, not ignored."""
+    if checkpoint or resume is not None or warm_start is not None:
+        raise ValueError("Checkpoints, resume and warm starts are not supported with n_islands > 1")
+
+
+def print_island_statistics(islands):
+    for i, island in enumerate(islands):
+        print(f"Island {i}: best distance {island['best_distance']:.2f}, final mean distance {island['mean_distance']:.2f}")
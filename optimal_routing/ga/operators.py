@@ -0,0 +1,80 @@
+import numpy as np
+
+# A population is one (n_routes, n) int32 array, each row a permutation of the city indices 0..n-1.
+# Every operator below works on many rows at once, through index arithmetic instead of per-city membership tests.
+
+
+def random_routes(n_routes, n):
+    """n_routes random permutations of 0..n-1."""
+    return np.argsort(np.random.rand(n_routes, n), axis=1).astype(np.int32)
+
+
+def random_pairs(m, n):
+    """m pairs of distinct positions i < j, like sorted(random.sample(range(n), 2))."""
+    i = np.random.randint(0, n, m)
+    j = np.random.randint(0, n - 1, m)
+    j += j >= i  # Skip over i, so the two positions always differ
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def inverse(routes):
+    """Position of every city in each route: inverse(routes)[r, routes[r, p]] == p."""
+    positions = np.empty_like(routes)
+    np.put_along_axis(positions, routes, np.arange(routes.shape[1], dtype=routes.dtype)[None, :], axis=1)
+    return positions
+
+
+def ordered_crossover(parents1, parents2, wrap=False):
+    """Ordered crossover (OX) of every row pair: a random segment of parents1 stays in place and the
+    remaining cities follow in parents2's order.
+
+    They fill the free positions from the left, or with wrap=True from just after the segment, wrapping around.
+    """
+    m, n = parents1.shape
+    start, end = random_pairs(m, n)
+    positions = np.arange(n)
+    segment = (positions >= start[:, None]) & (positions <= end[:, None])
+
+    # Cities inside each row's segment, found through the inverse permutation of parents1
+    in_segment = np.take_along_axis(segment, inverse(parents1), axis=1)
+    cities = parents2[~np.take_along_axis(in_segment, parents2, axis=1)]  # Row by row, in parents2's order
+
+    if wrap:
+        order = (end[:, None] + 1 + positions) % n
+        free = order[~np.take_along_axis(segment, order, axis=1)]
+    else:
+        free = np.broadcast_to(positions, (m, n))[~segment]
+
+    children = np.where(segment, parents1, 0).astype(np.int32)
+    children[np.repeat(np.arange(m), n - (end - start + 1)), free] = cities
+    return children
+
+
+def permute_rows(routes, rows, sources):
+    """routes[r, p] = routes[r, sources[k, p]] for every row r = rows[k], in place."""
+    routes[rows] = np.take_along_axis(routes[rows], sources, axis=1)
+
+
+def swap_mutation(routes, rows):
+    """Swap two random cities in each of the given rows, in place."""
+    i, j = random_pairs(len(rows), routes.shape[1])
+    routes[rows, i], routes[rows, j] = routes[rows, j], routes[rows, i].copy()
+
+
+def insert_mutation(routes, rows):
+    """Move a random city of each given row to a random position, shifting the cities in between, in place."""
+    n = routes.shape[1]
+    taken = np.random.randint(0, n, len(rows))[:, None]
+    put = np.random.randint(0, n, len(rows))[:, None]
+    positions = np.arange(n)
+    sources = positions + ((positions >= taken) & (positions < put)) - ((positions > put) & (positions <= taken))
+    sources = np.where(positions == put, taken, sources)
+    permute_rows(routes, rows, sources)
+
+
+def reverse_mutation(routes, rows):
+    """Reverse a random segment of each given row, in place."""
+    n = routes.shape[1]
+    i, j = (bound[:, None] for bound in random_pairs(len(rows), n))
+    positions = np.arange(n)
+    permute_rows(routes, rows, np.where((positions >= i) & (positions <= j), i + j - positions, positions))
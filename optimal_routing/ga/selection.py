@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def evaluate(population, fitness):
+    """Fitness of every individual as an array; meant to be computed once per generation."""
+    return np.fromiter((fitness(individual) for individual in population), dtype=float, count=len(population))
+
+
+def evaluate_routes(population, network):
+    """Inverse tour length of every row of a (pop, n) route array, 0 for zero-length tours, in one matrix gather."""
+    lengths = network.route_lengths(population)
+    return np.divide(1, lengths, out=np.zeros_like(lengths), where=lengths > 0)
+
+
+def roulette_wheel_selection(scores, n):
+    """n indices drawn with probability proportional to score, via one cumulative sum and a batched searchsorted."""
+    cumulative = np.cumsum(scores)
+    if cumulative[-1] <= 0:  # Nothing to weight by, every individual is equally likely
+        return np.random.randint(0, len(scores), n)
+    picks = np.random.uniform(0, cumulative[-1], n)
+    return np.minimum(np.searchsorted(cumulative, picks, side='right'), len(scores) - 1)
+
+
+def tournament_selection(scores, n, tournament_size=5):
+    """n indices, each the fittest of tournament_size distinct individuals drawn at random."""
+    tournament_size = min(tournament_size, len(scores))
+    # Floyd's sampling, every row at once: the j-th draw is from [0, j], or j itself when already drawn, which
+    # keeps each row's contestants distinct at O(n * tournament_size) memory whatever the population size
+    contestants = np.empty((n, tournament_size), dtype=np.intp)
+    for step, j in enumerate(range(len(scores) - tournament_size, len(scores))):
+        draw = np.random.randint(0, j + 1, n)
+        taken = (contestants[:, :step] == draw[:, None]).any(axis=1)
+        contestants[:, step] = np.where(taken, j, draw)
+    return contestants[np.arange(n), np.argmax(scores[contestants], axis=1)]
+
+
+SELECTION_METHODS = {
+    'roulette': roulette_wheel_selection,
+    'tournament': tournament_selection,
+}
+
+
+def select(scores, n, method='tournament', **options):
+    """Indices of n parents chosen from precomputed scores with the named selection method."""
+    return SELECTION_METHODS[method](np.asarray(scores, dtype=float), n, **options)
+
+
+def rank(population, scores):
+    """Population and scores sorted best first (stable, like sorted(..., reverse=True))."""
+    order = np.argsort(-scores, kind='stable')
+    if isinstance(population, np.ndarray):
+        return population[order], scores[order]
+    return [population[i] for i in order], scores[order]
@@ -0,0 +1,154 @@
+"""Content-addressed disk cache of preprocessed instances: distance matrices, neighbour lists, heuristic matrices.
+
+An entry is a directory named after a hash of the instance's coordinates (with their metric) or of its explicit
+matrix, holding one .npy file per array. Arrays are memory-mapped when read, so a run on a network seen before
+skips the preprocessing and pages in only what the solver touches. The cache is bounded in bytes: once it
+grows past max_bytes, the least recently used entries are deleted.
+"""
+import hashlib
+import os
+import shutil
+
+import numpy as np
+
+from .instances import Instance
+from .local_search import LOCAL_SEARCHES, neighbour_lists
+
+MAX_BYTES = 2 * 2**30  # Default bound on the cache's size on disk
+
+
+def content_key(kind, data, edge_weight_type='EUC'):
+    """Hash of an instance given as 'points' (distances measured with edge_weight_type) or as a 'matrix'."""
+    data = np.ascontiguousarray(data)
+    digest = hashlib.blake2b(digest_size=16)
+    metric = edge_weight_type if kind == 'points' else 'EXPLICIT'
+    digest.update(f'{kind}:{metric}:{data.dtype.str}:{data.shape}'.encode())
+    digest.update(data.tobytes())  # A buffer copy at most; the hash streams through it
+    return digest.hexdigest()
+
+
+class InstanceCache:
+    """Directory of cached instances, each entry a subdirectory; see the module docstring."""
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def entry(self, points=None, distances=None, edge_weight_type='EUC'):
+        """The entry of the instance with these coordinates, or else with this explicit distance matrix."""
+        if points is not None:
+            key = content_key('points', np.asarray(points, dtype=float), edge_weight_type)
+        else:
+            key = content_key('matrix', np.asarray(distances, dtype=float))
+        return CacheEntry(self, key, Instance(key, points, distances, edge_weight_type))
+
+    def entry_for(self, instance):
+        """The entry of an instances.Instance: keyed by its coordinates unless its matrix is explicit."""
+        if instance.distances is not None:
+            return self.entry(distances=instance.distances)
+        return self.entry(points=instance.points, edge_weight_type=instance.edge_weight_type)
+
+    def size(self):
+        return sum(entry_size(path) for path in self.entry_paths())
+
+    def entry_paths(self):
+        return [entry.path for entry in os.scandir(self.directory) if entry.is_dir()]
+
+    def evict(self, keep=None):
+        """Delete least recently used entries (never keep, a path) until the cache fits in max_bytes."""
+        sizes = {path: entry_size(path) for path in self.entry_paths()}
+        total = sum(sizes.values())
+        for path in sorted(sizes, key=last_used):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)  # Processes that have its arrays mapped keep reading them
+            total -= sizes[path]
+
+    def clear(self):
+        for path in self.entry_paths():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def cache_entry(cache, points=None, distances=None, edge_weight_type='EUC'):
+    """The entry of an instance in cache, an InstanceCache; a CacheEntry passed as cache is already the entry."""
+    if isinstance(cache, CacheEntry):
+        return cache
+    return cache.entry(points, distances, edge_weight_type)
+
+
+class CacheEntry:
+    """The cached arrays of one instance, each built on first request and memory-mapped from then on."""
+
+    def __init__(self, cache, key, instance):
+        self.cache = cache
+        self.key = key
+        self.instance = instance
+        self.path = os.path.join(cache.directory, key)
+        self.built = []  # Names of the arrays this entry had to compute rather than read
+
+    def arrays(self, names, build):
+        """The named arrays, read from disk, or returned by build() (a tuple, one array per name) and stored.
+
+        Arrays read from disk are copy-on-write mappings: a solver may change them, the files stay as they are.
+        """
+        files = [os.path.join(self.path, f'{name}.npy') for name in names]
+        if all(os.path.exists(file) for file in files):
+            touch(self.path)
+            try:
+                return tuple(load_array(file) for file in files)
+            except (OSError, ValueError):  # Evicted or cut short under our feet; build it again
+                pass
+        arrays = tuple(np.asarray(array) for array in build())
+        os.makedirs(self.path, exist_ok=True)
+        for file, array in zip(files, arrays):
+            partial = f'{file}.{os.getpid()}.partial'  # Processes building the same array do not clash
+            with open(partial, 'wb') as f:
+                np.save(f, array)
+            os.replace(partial, file)
+        self.built.extend(names)
+        touch(self.path)
+        self.cache.evict(keep=self.path)
+        return arrays
+
+    def array(self, name, build):
+        """One array; see arrays()."""
+        return self.arrays((name,), lambda: (build(),))[0]
+
+    def distances(self):
+        """The full distance matrix."""
+        return self.array('distances', lambda: np.asarray(self.instance.distance_matrix(), dtype=float))
+
+    def neighbour_lists(self, n_neighbours=8):
+        """The local searches' neighbour lists (see local_search.neighbour_lists)."""
+        return self.array(f'neighbours-{n_neighbours}', lambda: neighbour_lists(self.distances(), n_neighbours))
+
+    def local_search(self, name, closed=True, n_neighbours=8):
+        """The named LocalSearch over the cached matrix, its neighbour lists from the cache too."""
+        return LOCAL_SEARCHES[name](self.distances(), n_neighbours, closed=closed,
+                                    neighbours=self.neighbour_lists(n_neighbours))
+
+
+def load_array(file):
+    # A plain ndarray over the mapping: the solvers' inner loops do not pay for np.memmap's subclass hooks
+    return np.load(file, mmap_mode='c', allow_pickle=False).view(np.ndarray)
+
+
+def touch(path):
+    os.utime(path)  # An entry's modification time is its last use
+
+
+def last_used(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def entry_size(path):
+    try:
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    except OSError:  # Removed meanwhile
+        return 0
@@ -0,0 +1,276 @@
+import os
+import numpy as np
+
+# TSPLIB explicit formats, keyed by which entries of each row are listed.
+# The *_COL formats list the transpose, which for a symmetric matrix is the opposite *_ROW format.
+ROW_FORMATS = {
+    'UPPER_ROW': 'upper', 'LOWER_COL': 'upper',
+    'LOWER_ROW': 'lower', 'UPPER_COL': 'lower',
+    'UPPER_DIAG_ROW': 'upper_diag', 'LOWER_DIAG_COL': 'upper_diag',
+    'LOWER_DIAG_ROW': 'lower_diag', 'UPPER_DIAG_COL': 'lower_diag',
+}
+PARSE_BATCH = 1 << 20  # Numbers parsed per batch while streaming an explicit matrix
+
+
+class Instance:
+    """A routing problem: coordinates, an explicit distance matrix, or both.
+
+    Large arrays may be np.memmap views, so nothing is read into RAM until a solver touches it.
+    """
+
+    def __init__(self, name, points=None, distances=None, edge_weight_type='EUC', comment=''):
+        self.name = name
+        self.points = points
+        self.distances = distances
+        self.edge_weight_type = edge_weight_type
+        self.comment = comment
+
+    @property
+    def n(self):
+        return len(self.points) if self.points is not None else len(self.distances)
+
+    def distance_matrix(self, out=None, chunk_rows=1024):
+        """The explicit matrix, or one computed from the coordinates block by block (into out, e.g. a memmap)."""
+        if self.distances is not None:
+            return self.distances
+        if out is None:
+            out = np.empty((self.n, self.n))
+        for lo in range(0, self.n, chunk_rows):
+            hi = min(lo + chunk_rows, self.n)
+            out[lo:hi] = pairwise_distances(self.points[lo:hi], self.points, self.edge_weight_type)
+        np.fill_diagonal(out, 0)  # GEO rounds every distance up, including a point's distance to itself
+        return out
+
+
+def nint(x):
+    return np.floor(x + 0.5)
+
+
+def geo_radians(coordinates):
+    # TSPLIB GEO coordinates are DDD.MM (degrees and minutes)
+    degrees = np.trunc(coordinates)
+    return 3.141592 * (degrees + 5.0 * (coordinates - degrees) / 3.0) / 180.0
+
+
+def pairwise_distances(a, b, edge_weight_type='EUC'):
+    """Distances from every point in a to every point in b, following the TSPLIB rounding rules."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    return point_distances(a[:, None], b[None, :], edge_weight_type)
+
+
+def point_distances(a, b, edge_weight_type='EUC'):
+    """Distances between the points of a and b (arrays of (x, y) rows that broadcast against each other)."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    delta = a[..., :2] - b[..., :2]
+    if edge_weight_type == 'EUC':  # Plain, unrounded Euclidean distance for raw coordinate files
+        return np.sqrt((delta ** 2).sum(axis=-1))
+    if edge_weight_type == 'EUC_2D':
+        return nint(np.sqrt((delta ** 2).sum(axis=-1)))
+    if edge_weight_type == 'CEIL_2D':
+        return np.ceil(np.sqrt((delta ** 2).sum(axis=-1)))
+    if edge_weight_type == 'MAN_2D':
+        return nint(np.abs(delta).sum(axis=-1))
+    if edge_weight_type == 'MAX_2D':
+        return np.maximum(nint(np.abs(delta[..., 0])), nint(np.abs(delta[..., 1])))
+    if edge_weight_type == 'ATT':
+        r = np.sqrt((delta ** 2).sum(axis=-1) / 10.0)
+        t = nint(r)
+        return np.where(t < r, t + 1, t)
+    if edge_weight_type == 'GEO':
+        lat_a, lon_a = geo_radians(a[..., 0]), geo_radians(a[..., 1])
+        lat_b, lon_b = geo_radians(b[..., 0]), geo_radians(b[..., 1])
+        q1 = np.cos(lon_a - lon_b)
+        q2 = np.cos(lat_a - lat_b)
+        q3 = np.cos(lat_a + lat_b)
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.trunc(6378.388 * np.arccos(cosine) + 1.0)
+    raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type}")
+
+
+def load_instance(path, **options):
+    """Load a TSPLIB (.tsp/.atsp), .npy or raw binary instance, picking the reader from the extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.tsp', '.atsp'):
+        return load_tsplib(path, **options)
+    if extension == '.npy':
+        array = np.load(path, mmap_mode='r')
+        if array.ndim == 2 and array.shape[0] == array.shape[1] and array.shape[1] != 2:
+            return Instance(os.path.basename(path), distances=array, edge_weight_type='EXPLICIT')
+        return Instance(os.path.basename(path), points=array)
+    kind = options.pop('kind', None)
+    if kind == 'coordinates':
+        return load_coordinates(path, **options)
+    if kind == 'matrix':
+        return load_matrix(path, **options)
+    raise ValueError(f"Cannot tell the format of {path}; pass kind='coordinates' or kind='matrix'")
+
+
+def load_coordinates(path, dtype=np.float64, dimensions=2):
+    """Raw binary coordinates, n rows of `dimensions` values, memory-mapped."""
+    points = np.memmap(path, dtype=dtype, mode='r')
+    return Instance(os.path.basename(path), points=points.reshape(-1, dimensions))
+
+
+def load_matrix(path, dtype=np.float64, n=None):
+    """Raw binary row-major n x n matrix, memory-mapped; n defaults to the square root of the entry count."""
+    flat = np.memmap(path, dtype=dtype, mode='r')
+    if n is None:
+        n = int(round(np.sqrt(flat.size)))
+    if n * n != flat.size:
+        raise ValueError(f"{path} holds {flat.size} values, which is not an n x n matrix")
+    return Instance(os.path.basename(path), distances=flat.reshape(n, n), edge_weight_type='EXPLICIT')
+
+
+def load_tsplib(path, cache_dir=None):
+    """Read a TSPLIB file with NODE_COORD_SECTION or an EXPLICIT EDGE_WEIGHT_SECTION.
+
+    Explicit matrices are parsed as a stream. With cache_dir they are written to an .npy file there
+    and memory-mapped, so later loads of the same file skip the parsing and the RAM copy entirely.
+    """
+    header = {}
+    points = None
+    distances = None
+    with open(path) as file:
+        f = LineReader(file)
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            keyword = line.split(':')[0].strip().upper()
+            if keyword == 'EOF':
+                break
+            if keyword in ('NODE_COORD_SECTION', 'DISPLAY_DATA_SECTION'):
+                coordinates = read_coordinates(f, int(header['DIMENSION']))
+                if keyword == 'NODE_COORD_SECTION' or points is None:
+                    points = coordinates
+            elif keyword == 'EDGE_WEIGHT_SECTION':
+                distances = read_edge_weights(f, int(header['DIMENSION']), header.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX'),
+                                              cached_matrix_path(path, cache_dir))
+            elif ':' in line:
+                header[keyword] = line.split(':', 1)[1].strip()
+
+    edge_weight_type = header.get('EDGE_WEIGHT_TYPE', 'EUC_2D')
+    if edge_weight_type == 'EXPLICIT' and distances is None:
+        raise ValueError(f"{path} declares EXPLICIT edge weights but has no EDGE_WEIGHT_SECTION")
+    return Instance(header.get('NAME', os.path.basename(path)), points=points,
+                    distances=distances if edge_weight_type == 'EXPLICIT' else None,
+                    edge_weight_type=edge_weight_type, comment=header.get('COMMENT', ''))
+
+
+class LineReader:
+    """The lines of a text file, with one line of push-back: a section reader that reaches the next keyword
+    returns it to the file, so the caller still sees that section."""
+
+    def __init__(self, f):
+        self.f = f
+        self.pushed = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def readline(self):
+        if self.pushed is None:
+            return self.f.readline()
+        line, self.pushed = self.pushed, None
+        return line
+
+    def push_back(self, line):
+        self.pushed = line
+
+
+def read_coordinates(f, n):
+    points = np.empty((n, 2))
+    for i in range(n):
+        fields = f.readline().split()
+        points[i] = float(fields[1]), float(fields[2])  # First field is the 1-based node number
+    return points
+
+
+def cached_matrix_path(path, cache_dir):
+    if cache_dir is None:
+        return None
+    stat = os.stat(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-{stat.st_size}-{int(stat.st_mtime)}.npy")
+
+
+def read_edge_weights(f, n, edge_weight_format, cache_path=None):
+    """Stream the numbers of an EDGE_WEIGHT_SECTION into a dense matrix (a memmap when cache_path is given)."""
+    if cache_path is not None and os.path.exists(cache_path):
+        return np.load(cache_path, mmap_mode='r')
+    if edge_weight_format != 'FULL_MATRIX' and edge_weight_format not in ROW_FORMATS:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT: {edge_weight_format}")
+
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        matrix = np.lib.format.open_memmap(cache_path + '.partial', mode='w+', dtype=np.float64, shape=(n, n))
+    else:
+        matrix = np.zeros((n, n))
+
+    if edge_weight_format == 'FULL_MATRIX':
+        flat = matrix.reshape(-1)
+        filled = 0
+        for values in number_batches(f, n * n):
+            flat[filled:filled + len(values)] = values
+            filled += len(values)
+    else:
+        # Rows of a triangle have different lengths; each one is mirrored into the other half
+        shape = ROW_FORMATS[edge_weight_format]
+        row_columns = {
+            'upper': lambda i: range(i + 1, n),
+            'lower': lambda i: range(0, i),
+            'upper_diag': lambda i: range(i, n),
+            'lower_diag': lambda i: range(0, i + 1),
+        }[shape]
+        total = sum(len(row_columns(i)) for i in range(n))
+        row, pending = 0, np.empty(0)
+        for values in number_batches(f, total):
+            pending = np.concatenate((pending, values))
+            while row < n and len(row_columns(row)) <= len(pending):
+                columns = row_columns(row)
+                width = len(columns)
+                if width:
+                    matrix[row, columns.start:columns.stop] = pending[:width]
+                    matrix[columns.start:columns.stop, row] = pending[:width]
+                pending = pending[width:]
+                row += 1
+
+    if cache_path is None:
+        return matrix
+    matrix.flush()
+    del matrix
+    os.replace(cache_path + '.partial', cache_path)
+    return np.load(cache_path, mmap_mode='r')
+
+
+def number_batches(f, count):
+    """Yield the next `count` numbers in f (a LineReader) as arrays, a batch at a time, without reading past them."""
+    remaining = count
+    tokens = []
+    for line in f:
+        fields = line.split()
+        if fields and fields[0][0].isalpha():  # Next section or EOF, left for load_tsplib()
+            f.push_back(line)
+            break
+        tokens.extend(fields)
+        if len(tokens) >= min(PARSE_BATCH, remaining):
+            values = np.array(tokens[:remaining], dtype=float)
+            remaining -= len(values)
+            tokens = []
+            yield values
+            if remaining <= 0:
+                return
+    if tokens:
+        values = np.array(tokens[:remaining], dtype=float)
+        remaining -= len(values)
+        yield values
+    if remaining > 0:
+        raise ValueError(f"EDGE_WEIGHT_SECTION ended {remaining} values early")
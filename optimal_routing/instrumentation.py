@@ -0,0 +1,200 @@
+"""Per-phase timers, counters, per-iteration traces and peak-memory samples of solver runs.
+
+Every solver takes instruments (an Instruments, or None to leave instrumentation off). Switched off, the
+solvers talk to NO_INSTRUMENTS, whose methods do nothing, so a run pays a few empty calls per iteration.
+The collected data exports as JSON or as Prometheus text.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+
+class Phase:
+    """Context manager that charges the time spent inside it to one phase."""
+    __slots__ = ('instruments', 'name')
+
+    def __init__(self, instruments, name):
+        self.instruments = instruments
+        self.name = name
+
+    def __enter__(self):
+        self.instruments.enter(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instruments.exit()
+
+
+class Instruments:
+    """Collects what one solver run spends its time and evaluations on.
+
+    Phase times are exclusive: time spent in a phase nested inside another one (e.g. 'distance' inside
+    'construct') counts for the inner phase only, so the phases add up to the instrumented part of the run.
+    With trace_memory=True, tracemalloc runs until close() and every trace records the peak since the previous one.
+    """
+    enabled = True
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.seconds = {}  # Phase -> cumulative exclusive seconds
+        self.calls = {}  # Phase -> number of times it was entered
+        self.counters = {}
+        self.traces = []
+        self.peak_memory = None
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.stack = []
+        self.mark = self.started
+        self.owns_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+        if self.owns_tracemalloc:
+            tracemalloc.start()
+
+    def options(self):
+        """Keyword arguments that build a matching Instruments, e.g. in a worker process."""
+        return {'trace_memory': self.trace_memory}
+
+    def phase(self, name):
+        """Context manager timing one pass through the named phase."""
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, name)
+        return phase
+
+    def enter(self, name):
+        now = time.perf_counter()
+        if self.stack:  # The enclosing phase pauses while this one runs
+            self.charge(self.stack[-1], now)
+        self.stack.append(name)
+        self.mark = now
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def exit(self):
+        now = time.perf_counter()
+        self.charge(self.stack.pop(), now)
+        self.mark = now
+
+    def charge(self, name, now):
+        self.seconds[name] = self.seconds.get(name, 0.0) + (now - self.mark)
+
+    def count(self, name, n=1):
+        """Add n to the named counter, e.g. 'evaluations' or 'local_search_moves'."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def trace(self, iteration, best_length):
+        """Record one iteration: best length, elapsed time, the counters so far and, if traced, peak memory."""
+        row = {'iteration': iteration, 'best_length': float(best_length), 'elapsed': self.elapsed(), **self.counters}
+        if self.trace_memory and tracemalloc.is_tracing():
+            row['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            self.peak_memory = max(self.peak_memory or 0, row['peak_memory'])
+        self.traces.append(row)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def merge(self, data):
+        """Add the timers, counters and peak memory of another run's as_dict(), e.g. from a worker process."""
+        for name, phase in data['phases'].items():
+            self.seconds[name] = self.seconds.get(name, 0.0) + phase['seconds']
+            self.calls[name] = self.calls.get(name, 0) + phase['calls']
+        for name, value in data['counters'].items():
+            self.count(name, value)
+        if data['peak_memory'] is not None:
+            self.peak_memory = max(self.peak_memory or 0, data['peak_memory'])
+
+    def close(self):
+        """Stop tracemalloc if this object started it; the collected data stays available."""
+        if self.owns_tracemalloc:
+            self.peak_memory = max(self.peak_memory or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            self.owns_tracemalloc = False
+
+    def as_dict(self):
+        return {
+            'elapsed': self.elapsed(),
+            'phases': {name: {'seconds': seconds, 'calls': self.calls[name]} for name, seconds in self.seconds.items()},
+            'counters': dict(self.counters),
+            'peak_memory': self.peak_memory,
+            'traces': list(self.traces),
+        }
+
+    def to_json(self, path=None):
+        """The data as JSON text, also written to path if given."""
+        text = json.dumps(self.as_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+
+    def to_prometheus(self, prefix='optimal_routing', labels=None):
+        """The data in the Prometheus text exposition format; labels (a dict) are added to every sample."""
+        labels = labels or {}
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for extra, value in samples:
+                pairs = ','.join(f'{key}="{escape(val)}"' for key, val in {**labels, **extra}.items())
+                lines.append(f"{prefix}_{name}{{{pairs}}} {value}" if pairs else f"{prefix}_{name} {value}")
+
+        metric('phase_seconds_total', 'counter', "Exclusive wall-clock seconds spent in each solver phase.",
+               [({'phase': name}, seconds) for name, seconds in self.seconds.items()])
+        metric('phase_calls_total', 'counter', "Times each solver phase was entered.",
+               [({'phase': name}, calls) for name, calls in self.calls.items()])
+        for name, value in self.counters.items():
+            metric(f'{name}_total', 'counter', f"Solver {name.replace('_', ' ')}.", [({}, value)])
+        metric('iterations_total', 'counter', "Iterations traced.", [({}, len(self.traces))])
+        if self.traces:
+            metric('best_length', 'gauge', "Best tour length at the last traced iteration.",
+                   [({}, self.traces[-1]['best_length'])])
+        metric('elapsed_seconds', 'gauge', "Seconds since instrumentation started.", [({}, self.elapsed())])
+        if self.peak_memory is not None:
+            metric('peak_memory_bytes', 'gauge', "Peak memory traced by tracemalloc.", [({}, self.peak_memory)])
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path, **prometheus_options):
+        """Write the data to path: Prometheus text for .prom files, JSON otherwise."""
+        if str(path).endswith('.prom'):
+            with open(path, 'w') as file:
+                file.write(self.to_prometheus(**prometheus_options))
+        else:
+            self.to_json(path)
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class NullInstruments:
+    """Instrumentation switched off: every call does nothing."""
+    enabled = False
+    trace_memory = False
+
+    def options(self):
+        return None
+
+    def phase(self, name):
+        return NULL_PHASE
+
+    def count(self, name, n=1):
+        pass
+
+    def trace(self, iteration, best_length):
+        pass
+
+    def merge(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_PHASE = nullcontext()
+NO_INSTRUMENTS = NullInstruments()
+
+
+def resolve(instruments):
+    """The instruments a solver should report to: the given ones, or NO_INSTRUMENTS for None."""
+    return NO_INSTRUMENTS if instruments is None else instruments
@@ -0,0 +1,236 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import accumulate
+from .ga.distance_matrix import LIST_LOOKUP_MAX_CITIES
+
+
+def closeness(distances):
+    """Distance between two cities in whichever direction is shorter; infinite from a city to itself."""
+    closeness = np.minimum(distances, distances.T)
+    np.fill_diagonal(closeness, np.inf)
+    return closeness
+
+
+def neighbour_lists(distances, n_neighbours=8):
+    """Every city's n_neighbours nearest other cities, nearest first: the lists LocalSearch would compute."""
+    n_neighbours = min(n_neighbours, len(distances) - 1)
+    return np.argsort(closeness(np.asarray(distances, dtype=float)), axis=1)[:, :n_neighbours]
+
+
+class LocalSearch(ABC):
+    """Neighbour lists and the don't-look-bit loop shared by the move types below; each implements improve_city().
+
+    Tours are closed by default. With closed=False a tour is an open path from route[0], its last city
+    followed by a virtual city self.n at zero distance from every other, so the missing leg costs nothing.
+    """
+
+    def __init__(self, distances, n_neighbours=8, closed=True, neighbours=None):
+        self.distances = np.asarray(distances, dtype=float)
+        self.n = len(self.distances)
+        self.closed = closed
+        self.n_neighbours = n_neighbours
+        self.symmetric = np.allclose(self.distances, self.distances.T)
+        padded = np.pad(self.distances, ((0, 1), (0, 1)))  # Row and column n belong to the virtual city
+        self.rows = padded.tolist() if self.n <= LIST_LOOKUP_MAX_CITIES else padded
+
+        # Moves only ever reconnect a city to one of its nearest neighbours (in either direction);
+        # neighbours, e.g. from an instance_cache.InstanceCache, are neighbour_lists() computed beforehand
+        self.closeness = closeness(self.distances)
+        n_neighbours = min(n_neighbours, self.n - 1)
+        if neighbours is None:
+            neighbours = np.argsort(self.closeness, axis=1)
+        self.neighbours = np.asarray(neighbours)[:, :n_neighbours].tolist()
+        self.closeness = self.closeness.tolist() if self.n <= LIST_LOOKUP_MAX_CITIES else self.closeness
+        self.moves = 0  # Improving moves applied so far, over every improve() call
+
+    def improve(self, route):
+        """Apply improving moves until none is left; route[0] stays in place."""
+        tour = list(route)
+        if len(tour) < 4:
+            return tour
+
+        pos = [0] * self.n
+        for p, city in enumerate(tour):
+            pos[city] = p
+        costs = self.prefix_costs(tour)
+
+        # Don't-look bits: only cities in the queue are searched, a city re-enters it when one of its edges changes
+        queue = deque(tour)
+        queued = [False] * self.n
+        for city in tour:
+            queued[city] = True
+
+        while queue:
+            a = queue.popleft()
+            queued[a] = False
+            touched = self.improve_city(a, tour, pos, costs)
+            if not touched:
+                continue
+            self.moves += 1
+            if not self.symmetric:
+                costs = self.prefix_costs(tour)
+            for city in touched:
+                if city < self.n and not queued[city]:
+                    queue.append(city)
+                    queued[city] = True
+
+        return tour
+
+    @abstractmethod
+    def improve_city(self, a, tour, pos, costs):
+        """Apply the first improving move around city a; returns the cities whose edges changed, or ()."""
+
+    def settings(self):
+        """Constructor keyword arguments besides distances and neighbours."""
+        return {'n_neighbours': self.n_neighbours, 'closed': self.closed}
+
+    def rebuilt(self, distances):
+        """The same search with the same settings over new distances, its neighbour lists computed afresh."""
+        return type(self)(distances, **self.settings())
+
+    def successor(self, tour, p):
+        return tour[p + 1] if p + 1 < len(tour) else (tour[0] if self.closed else self.n)
+
+    def predecessor(self, tour, p):
+        return tour[p - 1] if p > 0 else (tour[-1] if self.closed else self.n)
+
+    def reversal_cost(self, lo, hi, costs):
+        """Extra cost of walking tour[lo:hi + 1] the other way round, which only asymmetric legs have."""
+        if self.symmetric:
+            return 0.0
+        forward, backward = costs
+        return (backward[hi] - backward[lo]) - (forward[hi] - forward[lo])
+
+    def prefix_costs(self, tour):
+        """Cumulative cost of walking the tour forwards and backwards up to each position."""
+        if self.symmetric:
+            return None, None
+        d = self.rows
+        forward = list(accumulate((d[a][b] for a, b in zip(tour, tour[1:])), initial=0.0))
+        backward = list(accumulate((d[b][a] for a, b in zip(tour, tour[1:])), initial=0.0))
+        return forward, backward
+
+
+class TwoOpt(LocalSearch):
+    """2-opt local search with O(1) move evaluation, neighbour lists and don't-look bits."""
+
+    def improve_city(self, a, tour, pos, costs):
+        for lo, hi in self.candidate_moves(a, tour, pos):
+            if self.reversal_delta(tour, lo, hi, costs) >= -1e-9:
+                continue
+
+            ends = (tour[lo - 1], tour[lo], tour[hi], self.successor(tour, hi))
+            tour[lo:hi + 1] = tour[hi:lo - 1:-1]  # Reverse the segment in place
+            for p in range(lo, hi + 1):
+                pos[tour[p]] = p
+            return ends
+        return ()
+
+    def candidate_moves(self, a, tour, pos):
+        """Segments [lo, hi] whose reversal adds an edge between a and one of its neighbours."""
+        p = pos[a]
+        d = self.rows
+        # A move from a can only gain if its new edge is shorter than one of the edges it leaves
+        limit = max(d[self.predecessor(tour, p)][a], d[a][self.successor(tour, p)])
+
+        closeness = self.closeness[a]
+        for c in self.neighbours[a]:
+            if closeness[c] >= limit:
+                break
+            first, last = sorted((p, pos[c]))
+            # Replace a -> succ(a) and c -> succ(c)
+            if last - first >= 2:
+                yield first + 1, last
+            # Replace pred(a) -> a and pred(c) -> c, never moving the first city
+            if first > 0 and last - first >= 2:
+                yield first, last - 1
+
+    def reversal_delta(self, tour, lo, hi, costs):
+        """Change in tour length from reversing tour[lo:hi + 1], using only the edges at its ends."""
+        d = self.rows
+        before, first, last, after = tour[lo - 1], tour[lo], tour[hi], self.successor(tour, hi)
+        return d[before][last] + d[first][after] - d[before][first] - d[last][after] + self.reversal_cost(lo, hi, costs)
+
+
+class OrOpt(LocalSearch):
+    """Or-opt: move a segment of up to max_segment cities, either way round, next to one of its end's neighbours.
+
+    Each move is a segment insertion (a 3-opt move that keeps the rest of the tour's direction), evaluated in O(1).
+    """
+
+    def __init__(self, distances, n_neighbours=8, closed=True, max_segment=3, neighbours=None):
+        super().__init__(distances, n_neighbours, closed, neighbours)
+        self.max_segment = max_segment
+
+    def settings(self):
+        return dict(super().settings(), max_segment=self.max_segment)
+
+    def improve_city(self, a, tour, pos, costs):
+        d = self.rows
+        n = len(tour)
+        p = pos[a]
+        for length in range(1, min(self.max_segment, n - 3) + 1):
+            for i in {p, p - length + 1}:  # The segment starting at a and the one ending at a
+                j = i + length - 1
+                if i < 1 or j >= n:  # The first city never moves
+                    continue
+                before, first, last, after = tour[i - 1], tour[i], tour[j], self.successor(tour, j)
+                gain = d[before][first] + d[last][after] - d[before][after]  # Saved by taking the segment out
+                if gain <= 1e-9:
+                    continue
+                for k, reverse in self.insertion_points(tour, pos, i, j, gain):
+                    u, v = tour[k], self.successor(tour, k)
+                    if reverse:
+                        added = d[u][last] + d[first][v] + self.reversal_cost(i, j, costs)
+                    else:
+                        added = d[u][first] + d[last][v]
+                    if added - d[u][v] - gain < -1e-9:
+                        self.move_segment(tour, pos, i, j, k, reverse)
+                        return before, first, last, after, u, v
+        return ()
+
+    def insertion_points(self, tour, pos, i, j, gain):
+        """Positions k to insert tour[i:j + 1] after, and whether reversed, that put an end next to a neighbour."""
+        n = len(tour)
+        for end, forward_after, reverse_after in ((tour[i], 0, -1), (tour[j], -1, 0)):
+            closeness = self.closeness[end]
+            for c in self.neighbours[end]:
+                if closeness[c] >= gain:  # The new edge alone would use up everything the removal saves
+                    break
+                for offset, reverse in ((forward_after, False), (reverse_after, True)):
+                    k = pos[c] + offset
+                    if k < 0:
+                        if not self.closed:  # Nothing may come before the start of an open path
+                            continue
+                        k = n - 1
+                    if k < i - 1 or k > j:  # Not where the segment already is
+                        yield k, reverse
+
+    def move_segment(self, tour, pos, i, j, k, reverse):
+        """Cut tour[i:j + 1] out and insert it after position k, reversed if asked."""
+        segment = tour[i:j + 1]
+        if reverse:
+            segment.reverse()
+        if k < i:
+            tour[k + 1:j + 1] = segment + tour[k + 1:i]
+            changed = range(k + 1, j + 1)
+        else:
+            tour[i:k + 1] = tour[j + 1:k + 1] + segment
+            changed = range(i, k + 1)
+        for p in changed:
+            pos[tour[p]] = p
+
+
+class Or2Opt(TwoOpt, OrOpt):
+    """Both neighbourhoods ("or2opt"): a 2-opt reversal is tried first, then an Or-opt segment move."""
+
+    def improve_city(self, a, tour, pos, costs):
+        return TwoOpt.improve_city(self, a, tour, pos, costs) or OrOpt.improve_city(self, a, tour, pos, costs)
+
+
+LOCAL_SEARCHES = {
+    '2opt': TwoOpt,
+    'oropt': OrOpt,
+    'or2opt': Or2Opt,
+}
@@ -0,0 +1,122 @@
+"""Plots that stay fast on large instances, shown on screen or written to files on machines without a display.
+
+All edges of a plot are one LineCollection rather than one artist each, and pheromone edges weaker than a
+fraction of the strongest are left out; point labels are only drawn on small instances. matplotlib is imported
+by the functions that draw, so importing this module stays cheap. A figure that is saved to a file gets its own
+Agg canvas and never goes through pyplot, so batch jobs on servers need no display and no backend setup.
+"""
+import os
+
+import numpy as np
+
+PHEROMONE_THRESHOLD = 0.05  # Edges with less pheromone than this fraction of the strongest are not drawn
+MAX_LABELS = 50  # Points are labelled only on instances up to this size
+BLOCK_CELLS = 2**22  # Pheromone matrix entries thresholded at once when picking the edges to draw
+ANIMATION_WRITERS = {'.mp4': 'ffmpeg', '.gif': 'pillow'}  # Other extensions save the last frame as an image
+
+
+def new_figure(output=None, figsize=(12, 8)):
+    """A pyplot figure to show, or, with an output path, a figure on its own Agg canvas."""
+    if output is None:
+        import matplotlib.pyplot as plt
+
+        return plt.figure(figsize=figsize)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def finish(figure, output=None):
+    """Show the figure, or write it to output in the format of its extension (.png, .svg, .pdf, ...)."""
+    if output is None:
+        import matplotlib.pyplot as plt
+
+        plt.show()
+    else:
+        figure.savefig(output)
+        print(f"Plot written to {output}")
+
+
+def label_points(ax, points, prefix='Point'):
+    if len(points) <= MAX_LABELS:
+        for i, point in enumerate(points):
+            ax.annotate(f'{prefix} {i}', (point[0], point[1]), xytext=(5, 5), textcoords='offset points')
+
+
+def upper_triangle_blocks(levels):
+    """(first row, block of rows) pairs covering a full (n, n) matrix, with every entry on or below the diagonal
+    set to -inf: the upper triangle, BLOCK_CELLS entries at a time instead of O(n^2) index arrays at once."""
+    n = len(levels)
+    step = max(1, BLOCK_CELLS // max(n, 1))
+    for lo in range(0, n, step):
+        hi = min(lo + step, n)
+        yield lo, np.where(np.arange(n) > np.arange(lo, hi)[:, None], levels[lo:hi], -np.inf)
+
+
+def pheromone_segments(points, levels, threshold=PHEROMONE_THRESHOLD, candidates=None):
+    """Line segments, a (k, 2, 2) array, of the edges holding at least threshold times the strongest pheromone,
+    and each edge's pheromone relative to the strongest.
+
+    levels is a full (n, n) matrix, of which the upper triangle is drawn, or (n, k) over candidate lists.
+    """
+    levels = np.asarray(levels)
+    if candidates is None:
+        strongest = max((block.max() for _, block in upper_triangle_blocks(levels)), default=0)
+    else:
+        strongest = levels.max() if levels.size else 0
+    if strongest <= 0:
+        return np.empty((0, 2, 2)), np.empty(0)
+
+    cutoff = threshold * strongest
+    if candidates is None:  # Only the kept edges are ever indexed
+        a, b, strength = [], [], []
+        for lo, block in upper_triangle_blocks(levels):
+            rows, columns = np.nonzero(block >= cutoff)
+            a.append(rows + lo)
+            b.append(columns)
+            strength.append(block[rows, columns])
+        a, b, strength = np.concatenate(a), np.concatenate(b), np.concatenate(strength)
+    else:
+        a = np.repeat(np.arange(len(levels)), levels.shape[1])
+        b = np.asarray(candidates).ravel()
+        strength = levels.ravel()
+        keep = np.flatnonzero(strength >= cutoff)
+        a, b, strength = a[keep], b[keep], strength[keep]
+    return np.stack((points[a, :2], points[b, :2]), axis=1), strength / strongest
+
+
+def edge_colors(strength, color='g', floor=0.0):
+    """RGBA rows of color, opaque in proportion to strength (at least floor)."""
+    from matplotlib.colors import to_rgba
+
+    colors = np.tile(to_rgba(color), (len(strength), 1))
+    colors[:, 3] = floor + (1 - floor) * strength
+    return colors
+
+
+def pheromone_collection(points, levels, threshold=PHEROMONE_THRESHOLD, candidates=None, color='g', floor=0.0,
+                         **kwargs):
+    """One LineCollection of the pheromone edges (see pheromone_segments()); kwargs go to LineCollection."""
+    from matplotlib.collections import LineCollection
+
+    segments, strength = pheromone_segments(points, levels, threshold, candidates)
+    return LineCollection(segments, colors=edge_colors(strength, color, floor), **kwargs)
+
+
+def animation_writer(output):
+    """Name of the matplotlib writer for an .mp4 (ffmpeg, needs it on the PATH) or .gif output path."""
+    from matplotlib.animation import writers
+
+    writer = ANIMATION_WRITERS[os.path.splitext(output)[1].lower()]
+    if not writers.is_available(writer):
+        raise RuntimeError(f"Cannot write {output}: matplotlib's {writer} writer is not available")
+    return writer
+
+
+def save_animation(animation, output, fps=5):
+    """Write every frame of a matplotlib animation to output; see animation_writer()."""
+    animation.save(output, writer=animation_writer(output), fps=fps)
+    print(f"Animation written to {output}")
@@ -0,0 +1,397 @@
+"""Local route-optimization service: python -m optimal_routing serve.
+
+HTTP/1.1 with JSON bodies, standard library only, one request per connection:
+
+    POST /solve  {"solver": "aco" | "ga" | "de", "points": [[x, y], ...] or "matrix": [[...], ...], "options": {...}}
+    GET  /stats
+
+Each worker process keeps an LRU cache of prepared instances (distance matrix, lookup rows, local-search
+neighbour lists), keyed by a hash of the request's points or matrix. A request goes to the worker that owns
+its hash, so repeated queries on the same network skip preprocessing, unless that worker is busy and another
+has less work: a burst on one network then spreads over the idle workers. A request identical to one still
+queued or running (same instance, solver and options) shares its result instead of being solved again.
+Request bodies are decoded, parsed and hashed in a thread, off the event loop. Every worker has a bounded
+queue; a request that finds every queue it may use full is turned away with 503.
+
+Instances of at most exact.EXACT_MAX_CITIES cities are solved exactly by Held-Karp, whatever the solver, unless
+the options say "exact": false.
+"""
+import asyncio
+import contextlib
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cli import GA_VARIANTS
+from .exact import EXACT_MAX_CITIES, held_karp
+from .ga.distance_matrix import DistanceMatrix
+from .instance_cache import content_key
+from .local_search import LOCAL_SEARCHES
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+QUEUE_SIZE = 16  # Requests waiting per worker before new ones are rejected
+CACHE_SIZE = 8  # Prepared instances kept per worker
+MAX_BODY_BYTES = 256 * 2**20
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large', 500: 'Internal Server Error',
+               503: 'Service Unavailable'}
+
+# Set in every worker by init_worker()
+instances = None
+
+
+class LRUCache:
+    """Mapping that holds at most max_size entries, dropping the least recently used first."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.items = OrderedDict()
+
+    def get(self, key):
+        if key not in self.items:
+            return None
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+
+class PreparedInstance:
+    """Everything the solvers derive from one instance before they start: built once, reused by every request."""
+
+    def __init__(self, points=None, matrix=None):
+        start = time.perf_counter()
+        self.points = points
+        if matrix is None:
+            matrix = np.linalg.norm(points[:, None] - points, axis=2)
+        self.matrix = np.ascontiguousarray(matrix, dtype=float)
+        self.n = len(self.matrix)
+        self.network = DistanceMatrix(range(self.n), self.matrix)
+        self.improvers = {}
+        self.build_time = time.perf_counter() - start  # Seconds spent preparing, so far
+
+    def local_search(self, name, closed=True):
+        """The named LocalSearch over this matrix; its neighbour lists are only computed on first use."""
+        if (name, closed) not in self.improvers:
+            start = time.perf_counter()
+            self.improvers[name, closed] = LOCAL_SEARCHES[name](self.matrix, closed=closed)
+            self.build_time += time.perf_counter() - start
+        return self.improvers[name, closed]
+
+
+def prepare(request):
+    """(kind, data, key): the parsed instance of a request and its content hash, both linear in its size."""
+    kind, data = parse_instance(request)
+    return kind, data, content_key(kind, data)
+
+
+def parse_instance(request):
+    """('points', (n, 2) array) or ('matrix', (n, n) array) from a request body."""
+    if 'points' in request:
+        points = np.asarray(request['points'], dtype=float)
+        if points.ndim != 2 or points.shape[1] != 2 or len(points) < 3:
+            raise ValueError("points must be a list of at least 3 [x, y] pairs")
+        return 'points', points
+    if 'matrix' in request:
+        matrix = np.asarray(request['matrix'], dtype=float)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1] or len(matrix) < 3:
+            raise ValueError("matrix must be a square list of lists, at least 3 x 3")
+        return 'matrix', matrix
+    raise ValueError("The request needs either points or matrix")
+
+
+def solve_aco(instance, n_ants=20, alpha=1, beta=5, evaporation_rate=0.1, local_search=None, time_limit=None,
+              target=None, **options):
+    from .aco.aco_gpt import AdaptiveACO
+
+    if local_search is not None:
+        local_search = instance.local_search(local_search, closed=False)
+    aco = AdaptiveACO(instance.n, n_ants, alpha, beta, evaporation_rate, points=instance.points,
+                      distances=instance.matrix, local_search=local_search, **options)
+    best_path, _ = aco.run(time_limit=time_limit, target=target, callback=None)
+    return best_path
+
+
+def solve_ga(instance, variant='exp', **options):
+    if variant not in GA_VARIANTS:
+        raise ValueError(f"Unknown GA variant: {variant}")
+    module = importlib.import_module(f'.ga.{variant}', __package__)
+    if variant in ('ga2', 'exp'):  # The variants with 2-opt reuse the cached neighbour lists
+        options['local_search'] = instance.local_search('2opt')
+    best_route = module.genetic_algorithm(instance.network, callback=None, **options)
+    return best_route[0] if isinstance(best_route, tuple) else best_route
+
+
+def solve_de(instance, local_search=None, **options):
+    from .de.de_gpt import differential_evolution
+
+    if local_search is not None:
+        local_search = instance.local_search(local_search)
+    best_solution, _ = differential_evolution(instance.matrix, local_search=local_search, callback=None, **options)
+    return best_solution.tolist()
+
+
+SOLVE_FUNCTIONS = {
+    'aco': solve_aco,
+    'ga': solve_ga,
+    'de': solve_de,
+}
+
+
+def init_worker(cache_size):
+    global instances
+    instances = LRUCache(cache_size)
+
+
+def warm_up():
+    """Import every solver module, so the first real request does not pay for it."""
+    for module in ('.aco.aco_gpt', '.de.de_gpt', *(f'.ga.{variant}' for variant in GA_VARIANTS)):
+        importlib.import_module(module, __package__)
+
+
+def solve(key, kind, data, solver, options):
+    """Worker side of one request: prepare the instance unless it is cached, then run the solver."""
+    start = time.perf_counter()
+    instance = instances.get(key)
+    cached = instance is not None
+    built = instance.build_time if cached else 0.0
+    if not cached:
+        instance = PreparedInstance(**{kind: data})
+        instances.put(key, instance)
+
+    options = dict(options)
+    seed = options.pop('seed', None)
+    exact = options.pop('exact', True) and instance.n <= EXACT_MAX_CITIES
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    if exact:
+        route = held_karp(instance.matrix)[0]
+    else:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            route = [int(city) for city in SOLVE_FUNCTIONS[solver](instance, **options)]
+    prepare_time = instance.build_time - built  # Including neighbour lists first needed by this solve
+    return {
+        'route': route,
+        'length': float(instance.network.route_length(route)),  # Closed tour, whatever the solver optimized
+        'exact': bool(exact),
+        'cached': cached,
+        'prepare_time': prepare_time,
+        'solve_time': time.perf_counter() - start - prepare_time,
+    }
+
+
+class RouteService:
+    """The asyncio server: bounded per-worker queues in front of single-process executors."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, queue_size=QUEUE_SIZE,
+                 cache_size=CACHE_SIZE):
+        self.host = host
+        self.port = port
+        self.n_workers = workers or os.cpu_count() or 1  # Also the number of solves running at once
+        self.queue_size = queue_size
+        self.cache_size = cache_size
+        self.stats = {'solved': 0, 'failed': 0, 'rejected': 0, 'coalesced': 0, 'cache_hits': 0, 'cache_misses': 0}
+        self.workers = []
+        self.queues = []
+        self.pending = []  # Requests queued for or running on each worker
+        self.in_flight = {}  # (instance key, solver, options JSON) -> (result future, worker), until solved
+        self.consumers = []
+        self.server = None
+
+    async def start(self):
+        """Start the workers and listen; port=0 picks a free port, stored back in self.port."""
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context('spawn')  # Forking a process that runs an event loop is not safe
+        self.workers = [ProcessPoolExecutor(1, mp_context=context, initializer=init_worker, initargs=(self.cache_size,))
+                        for _ in range(self.n_workers)]
+        await asyncio.gather(*(loop.run_in_executor(worker, warm_up) for worker in self.workers))
+        self.queues = [asyncio.Queue(self.queue_size) for _ in self.workers]
+        self.pending = [0] * self.n_workers
+        self.consumers = [asyncio.create_task(self.consume(i)) for i in range(self.n_workers)]
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for consumer in self.consumers:
+            consumer.cancel()
+        await asyncio.gather(*self.consumers, return_exceptions=True)
+        for worker in self.workers:
+            worker.shutdown(cancel_futures=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def submit(self, request):
+        """Queue one solve request (a decoded /solve body) and wait for its result."""
+        solver = request.get('solver', 'aco')
+        if solver not in SOLVE_FUNCTIONS:
+            raise ValueError(f"Unknown solver: {solver}")
+        options = request.get('options', {})
+        if not isinstance(options, dict):
+            raise ValueError("options must be an object")
+        kind, data, key = await asyncio.get_running_loop().run_in_executor(None, prepare, request)
+        job = (key, solver, json.dumps(options, sort_keys=True))
+
+        if job in self.in_flight:  # Solved once for every identical request that arrives meanwhile
+            self.stats['coalesced'] += 1
+            result, worker = self.in_flight[job]
+        else:
+            worker = self.pick_worker(key)
+            result = asyncio.get_running_loop().create_future()
+            try:
+                self.queues[worker].put_nowait((key, kind, data, solver, options, result))
+            except asyncio.QueueFull:
+                self.stats['rejected'] += 1
+                raise
+            self.pending[worker] += 1
+            self.in_flight[job] = result, worker
+            result.add_done_callback(lambda _: self.in_flight.pop(job, None))
+        response = await asyncio.shield(result)  # A dropped connection must not cancel a result others share
+        return {**response, 'instance': key, 'worker': worker}
+
+    def pick_worker(self, key):
+        """The worker that owns key and likely has the instance cached, or the least loaded one if it has less work."""
+        owner = int(key, 16) % self.n_workers
+        least_loaded = min(range(self.n_workers), key=self.pending.__getitem__)
+        return owner if self.pending[owner] <= self.pending[least_loaded] else least_loaded
+
+    async def consume(self, worker):
+        """Feed one worker from its queue, one solve at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            key, kind, data, solver, options, result = await self.queues[worker].get()
+            try:
+                response = await loop.run_in_executor(self.workers[worker], solve, key, kind, data, solver, options)
+            except Exception as error:
+                self.stats['failed'] += 1
+                if not result.done():
+                    result.set_exception(error)
+                continue
+            finally:
+                self.pending[worker] -= 1
+            self.stats['solved'] += 1
+            self.stats['cache_hits' if response['cached'] else 'cache_misses'] += 1
+            if not result.done():
+                result.set_result(response)
+
+    def snapshot(self):
+        return {**self.stats, 'workers': self.n_workers, 'queued': [queue.qsize() for queue in self.queues],
+                'in_flight': len(self.in_flight)}
+
+    async def dispatch(self, method, path, body):
+        """(status, payload) for one HTTP request."""
+        if method == 'GET' and path == '/stats':
+            return 200, self.snapshot()
+        if method != 'POST' or path != '/solve':
+            return 404, {'error': f"No route for {method} {path}"}
+        try:
+            request = await asyncio.get_running_loop().run_in_executor(None, json.loads, body)  # Off the event loop
+            if not isinstance(request, dict):
+                raise ValueError("The request body must be a JSON object")
+            return 200, await self.submit(request)
+        except asyncio.QueueFull:
+            return 503, {'error': "Too many queued requests, try again later"}
+        except (ValueError, TypeError, KeyError) as error:  # Bad JSON, instance or solver options
+            return 400, {'error': f"{type(error).__name__}: {error}"}
+        except Exception as error:
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            method, path, _ = (await reader.readline()).decode('latin-1').split(' ', 2)
+            headers = {}
+            while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY_BYTES:
+                status, payload = 413, {'error': f"Request bodies are limited to {MAX_BODY_BYTES} bytes"}
+            else:
+                status, payload = await self.dispatch(method, path, await reader.readexactly(length))
+        except (ValueError, asyncio.IncompleteReadError):
+            status, payload = 400, {'error': "Malformed HTTP request"}
+
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+    async def serve_forever(self):
+        async with self:
+            print(f"Serving on http://{self.host}:{self.port} with {self.n_workers} workers")
+            await self.server.serve_forever()
+
+
+class ServiceError(Exception):
+    """A request the service answered with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class Client:
+    """Minimal asyncio client for a RouteService on this machine."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+
+    async def solve(self, solver='aco', points=None, matrix=None, **options):
+        """Solve one instance; options go to the solver (plus seed, time_limit and target)."""
+        request = {'solver': solver, 'options': options}
+        if points is not None:
+            request['points'] = np.asarray(points, dtype=float).tolist()
+        if matrix is not None:
+            request['matrix'] = np.asarray(matrix, dtype=float).tolist()
+        return await self.request('POST', '/solve', request)
+
+    async def stats(self):
+        return await self.request('GET', '/stats')
+
+    async def request(self, method, path, payload=None):
+        body = b'' if payload is None else json.dumps(payload).encode()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            response = await reader.read()  # The server closes the connection after its reply
+        finally:
+            writer.close()
+        payload = json.loads(response.split(b'\r\n\r\n', 1)[1])
+        if status != 200:
+            raise ServiceError(status, payload.get('error'))
+        return payload
+
+
+def main(args):
+    """Serve until interrupted, with parsed cli.add_service_arguments() options; None keeps the default."""
+    options = {name: getattr(args, name) for name in ('host', 'port', 'workers', 'queue_size', 'cache_size')}
+    service = RouteService(**{name: value for name, value in options.items() if value is not None})
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(service.serve_forever())